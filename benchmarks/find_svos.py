@@ -0,0 +1,53 @@
+"""parity and scaling of IndexedDependencyParser.find_svos vs DependencyParser.find_svos
+
+the corpus is parsed once, only triple extraction is timed
+
+    python benchmarks/find_svos.py --model en_core_web_sm --sizes 1 4 16 64
+"""
+import argparse
+import time
+
+import spacy
+
+from ovos_coreferee.corpus import COREF_SENTENCES, TRIPLES_SENTENCES
+from ovos_coreferee.triples import DependencyParser, IndexedDependencyParser
+
+
+def time_svos(parser, doc, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parser.find_svos(doc)
+    return (time.perf_counter() - start) / rounds
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="en_core_web_trf")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    nlp = spacy.load(args.model)
+    reference = DependencyParser()
+    indexed = IndexedDependencyParser()
+
+    corpus = TRIPLES_SENTENCES + COREF_SENTENCES
+    mismatches = 0
+    for doc in nlp.pipe(corpus):
+        expected = reference.find_svos(doc)
+        got = indexed.find_svos(doc)
+        if got != expected:
+            mismatches += 1
+            print("MISMATCH:", doc.text)
+            print("  reference:", expected)
+            print("  indexed:  ", got)
+    print(f"parity: {len(corpus) - mismatches}/{len(corpus)}")
+
+    # long documents, the reference re-scans the tokens around every verb
+    paragraph = " ".join(corpus)
+    for n in args.sizes:
+        doc = nlp("\n\n".join([paragraph] * n))
+        ref = time_svos(reference, doc, args.rounds)
+        new = time_svos(indexed, doc, args.rounds)
+        print(f"{len(doc):>7} tokens  reference {ref * 1000:9.2f} ms  indexed {new * 1000:9.2f} ms  "
+              f"({new / len(doc) * 1e6:.2f} us/token)")
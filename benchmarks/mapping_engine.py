@@ -0,0 +1,107 @@
+"""parity and scaling of the replace_corefs rule layer (get_mapping + render)
+
+the corpus is parsed once, only the rule layer is timed. Outputs are compared
+with the original join-and-patch implementation kept below as a reference
+
+    python benchmarks/mapping_engine.py --model en_core_web_sm --sizes 1 4 16 64
+"""
+import argparse
+import time
+
+from ovos_coreferee.corpus import COREF_SENTENCES
+from ovos_coreferee.parser import CorefereeParser, COREF_CHAINS_KEY
+
+
+def reference_replace(parser, doc, join_tok=None):
+    """replace_corefs as originally written, quadratic in the number of tokens"""
+    chains = doc.user_data[COREF_CHAINS_KEY]
+    mapping = {}
+    prev_propn = None
+    for idx, tok in enumerate(doc):
+        next_token = doc[idx + 1] if idx < len(doc) - 1 else None
+        if tok.pos_ == "PROPN":
+            prev_propn = tok
+        elif tok.pos_ == "PRON":
+            if tok.text.lower() in ["me"]:
+                mapping[idx] = parser.first_person
+            elif tok.text.lower() in ["i"]:
+                mapping[idx] = parser.first_person
+                if next_token is None:
+                    pass
+                elif next_token.text == "have":
+                    mapping[idx + 1] = "has"
+                elif next_token.pos_ == "VERB" and next_token.text.endswith("e"):
+                    mapping[idx + 1] = next_token.text + "s"
+            elif tok.text.lower() in ["my", "mine"]:
+                mapping[idx] = parser.first_person + "'s"
+            elif tok.text.lower() in ["who"] and prev_propn:
+                mapping[idx] = prev_propn.text
+            elif tok.text.lower() in ["we"]:
+                nouns = [mapping.get(i) or t.text for i, t in enumerate(doc[:idx])
+                         if t.pos_ in ['NOUN', 'PROPN', 'PRON']]
+                if len(nouns) == 2 or join_tok is not None:
+                    mapping[idx] = " and ".join(nouns)
+                elif len(nouns) > 2:
+                    mapping[idx] = ", ".join(nouns[:-1]) + " and " + nouns[-1]
+
+    for chain in chains:
+        if any(len(mention) > 1 for mention in chain):
+            continue
+        ctoks = []
+        for m in chain:
+            ctoks += [doc[i] for i in m if doc[i].pos_ in ['NOUN', 'PROPN']]
+        if not ctoks:
+            continue
+        propers = [tok for tok in ctoks if tok.pos_ == 'PROPN']
+        resolve_tok = max(propers or ctoks, key=lambda k: len(k.text))
+        for mention in chain:
+            if resolve_tok.text != doc[mention[0]].text:
+                mapping[mention[0]] = resolve_tok.text
+
+    for chain in chains:
+        if any(len(mention) > 1 for mention in chain):
+            m = max(chain, key=len)
+            joint_str = " and ".join([mapping.get(i) or doc[i].text for i in m])
+            for mention in chain:
+                if len(mention) == 1:
+                    mapping[mention[0]] = joint_str
+
+    tokens = [mapping.get(idx, t.text) for idx, t in enumerate(doc)]
+    return " ".join(tokens).replace(" , ", ", ").replace(" .", ".")
+
+
+def time_rules(fn, doc, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(doc)
+    return (time.perf_counter() - start) / rounds
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="en_core_web_trf")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    parser = CorefereeParser(model=args.model, first_person_token="Miro", lazy=False)
+
+    mismatches = 0
+    for doc in parser.nlp.pipe(COREF_SENTENCES):
+        for join_tok in (None, " and "):
+            expected = reference_replace(parser, doc, join_tok)
+            got = parser.render(doc, parser.get_mapping(doc, join_tok))
+            if got != expected:
+                mismatches += 1
+                print("MISMATCH:", doc.text)
+                print("  reference:", expected)
+                print("  rewrite:  ", got)
+    print(f"parity: {2 * len(COREF_SENTENCES) - mismatches}/{2 * len(COREF_SENTENCES)}")
+
+    # multi paragraph transcripts, timing only the rule layer
+    paragraph = " ".join(COREF_SENTENCES)
+    for n in args.sizes:
+        doc = parser.nlp("\n\n".join([paragraph] * n))
+        ref = time_rules(lambda d: reference_replace(parser, d, " and "), doc, args.rounds)
+        new = time_rules(lambda d: parser.render(d, parser.get_mapping(d, " and ")), doc, args.rounds)
+        print(f"{len(doc):>7} tokens  reference {ref * 1000:9.2f} ms  rewrite {new * 1000:9.2f} ms")
@@ -0,0 +1,57 @@
+"""latency, RSS and output parity of CorefereeParser per pipeline profile
+
+each profile is measured in a fresh process with profile_mode="exclude" so the
+RSS figure only counts the components that profile actually loads
+
+    python benchmarks/profiles.py --model en_core_web_sm
+"""
+import argparse
+import json
+import multiprocessing
+import time
+
+from ovos_coreferee.corpus import COREF_SENTENCES
+from ovos_coreferee.parser import CorefereeParser, PIPELINE_PROFILES
+from ovos_coreferee.pool import rss_bytes
+
+
+def measure(model, profile, rounds, queue):
+    rss = rss_bytes()
+    parser = CorefereeParser(model=model, profile=profile, profile_mode="exclude", lazy=False)
+    loaded_rss = rss_bytes()
+    outputs = [parser.replace_corefs(t) for t in COREF_SENTENCES]  # warmup
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for t in COREF_SENTENCES:
+            parser.replace_corefs(t)
+    elapsed = (time.perf_counter() - start) / (rounds * len(COREF_SENTENCES))
+    queue.put({"profile": profile,
+               "excluded": parser.excluded,
+               "ms_per_utterance": round(elapsed * 1000, 2),
+               "model_rss_mb": round((loaded_rss - rss) / 1024 / 1024, 1),
+               "outputs": outputs})
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="en_core_web_trf")
+    ap.add_argument("--rounds", type=int, default=3)
+    # the triples profile skips coreferee itself, it is only meant for the triples pass
+    ap.add_argument("--profiles", nargs="+", default=["full", "coref"],
+                    choices=sorted(p for p in PIPELINE_PROFILES if p != "triples"))
+    args = ap.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for profile in args.profiles:
+        queue = ctx.Queue()
+        p = ctx.Process(target=measure, args=(args.model, profile, args.rounds, queue))
+        p.start()
+        results.append(queue.get())
+        p.join()
+
+    reference = results[0]["outputs"]
+    for r in results:
+        outputs = r.pop("outputs")
+        r["parity"] = sum(a == b for a, b in zip(reference, outputs)) / len(reference)
+        print(json.dumps(r))
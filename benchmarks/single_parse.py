@@ -0,0 +1,43 @@
+"""compare SpacyTriplesExtractor single_parse mode against the default two-parse path
+
+    python benchmarks/single_parse.py --model en_core_web_sm --rounds 5
+"""
+import argparse
+import time
+
+from ovos_coreferee.corpus import TRIPLES_SENTENCES
+from ovos_coreferee.triples import SpacyTriplesExtractor
+
+
+def run(extractor, single_parse, rounds):
+    extractor.single_parse = single_parse
+    triples = list(extractor.extract_triples(TRIPLES_SENTENCES))  # warmup
+    start = time.perf_counter()
+    for _ in range(rounds):
+        list(extractor.extract_triples(TRIPLES_SENTENCES))
+    elapsed = (time.perf_counter() - start) / rounds
+    return elapsed, triples
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="en_core_web_trf")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    extractor = SpacyTriplesExtractor({"model": args.model,
+                                       "first_person_token": "Miro"})
+    two_t, two_triples = run(extractor, False, args.rounds)
+    one_t, one_triples = run(extractor, True, args.rounds)
+
+    n = len(TRIPLES_SENTENCES)
+    print(f"two-parse:    {two_t * 1000 / n:.1f} ms/doc  {len(two_triples)} triples")
+    print(f"single-parse: {one_t * 1000 / n:.1f} ms/doc  {len(one_triples)} triples")
+    print(f"speedup:      {two_t / one_t:.2f}x")
+
+    common = set(two_triples) & set(one_triples)
+    print(f"parity:       {len(common)}/{len(set(two_triples))} triples shared")
+    for t in sorted(set(two_triples) - common):
+        print("  - only two-parse:", t)
+    for t in sorted(set(one_triples) - common):
+        print("  + only single-parse:", t)
@@ -0,0 +1,159 @@
+"""reproducible benchmark of the coref parser, the normalizer plugin and the triples extractor
+
+every target runs in a fresh process over the built-in corpora and reports
+cold start, per utterance p50/p95/p99 latency, batch throughput, peak RSS and
+its outputs. Results are printed as JSON, pass a previous result file as
+--baseline to check output parity between versions (or model tiers)
+
+    python benchmarks/suite.py --model en_core_web_sm --output sm.json
+    python benchmarks/suite.py --model en_core_web_sm --baseline sm.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+
+# corpus each target is measured on
+FIXTURES = {
+    "coref": "COREF_SENTENCES",
+    "normalizer": "COREF_SENTENCES",
+    "triples": "TRIPLES_SENTENCES"
+}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def resolved_utterances(texts, normalized):
+    """resolution of every text from the merged transform output, where each
+    utterance is followed by its resolution unless replace_corefs left it unchanged"""
+    inputs = set(texts)
+    resolved = {}
+    for u, s in zip(normalized, normalized[1:] + [None]):
+        if u in inputs and u not in resolved:
+            resolved[u] = u if s is None or s in inputs else s
+    return [resolved[t] for t in texts]
+
+
+def make_target(name, model):
+    """(single input fn, batch fn) for a target, result caches disabled"""
+    if name == "coref":
+        from ovos_coreferee.parser import CorefereeParser
+        parser = CorefereeParser(model=model, first_person_token="Miro")
+        return parser.replace_corefs, lambda texts: list(parser.replace_corefs_batch(texts))
+    if name == "normalizer":
+        from ovos_coreferee.opm import CorefereeNormalizerPlugin
+        plugin = CorefereeNormalizerPlugin(config={"model": model, "cache": False, "warmup": False})
+        return (lambda text: resolved_utterances([text], plugin.transform([text])[0])[0],
+                lambda texts: resolved_utterances(texts, plugin.transform(texts)[0]))
+    if name == "triples":
+        from ovos_coreferee.triples import SpacyTriplesExtractor
+        extractor = SpacyTriplesExtractor({"model": model, "first_person_token": "Miro"})
+        return (lambda text: [list(t) for t in extractor.extract_triples([text])],
+                lambda texts: [[list(t) for t in triples]
+                               for triples in extractor.extract_doc_triples(texts)])
+    raise ValueError(f"unknown target: {name}")
+
+
+def measure(name, model, rounds, repeat, queue):
+    start = time.perf_counter()
+    from ovos_coreferee import corpus
+    texts = getattr(corpus, FIXTURES[name])
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single, batch = make_target(name, model)
+    outputs = [single(texts[0])]
+    cold_start_s = time.perf_counter() - start
+    outputs += [single(t) for t in texts[1:]]  # warmup
+
+    latencies = []
+    for _ in range(rounds):
+        for t in texts:
+            start = time.perf_counter()
+            single(t)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    batch_outputs = batch(texts * repeat)
+    throughput = len(texts) * repeat / (time.perf_counter() - start)
+
+    queue.put({
+        "target": name,
+        "utterances": len(texts),
+        "import_s": round(import_s, 3),
+        "cold_start_s": round(cold_start_s, 3),
+        "latency_ms": {f"p{p}": round(percentile(latencies, p) * 1000, 2) for p in (50, 95, 99)},
+        "throughput_per_sec": round(throughput, 1),
+        # ru_maxrss is in KB on linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "batch_parity": sum(a == b for a, b in zip(outputs, batch_outputs[:len(texts)])) / len(texts),
+        "outputs": outputs
+    })
+
+
+def run_isolated(name, model, rounds, repeat):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    p = ctx.Process(target=measure, args=(name, model, rounds, repeat, queue))
+    p.start()
+    result = queue.get()
+    p.join()
+    return result
+
+
+def compare(result, baseline):
+    """fraction of outputs identical to the baseline run and the indexes that differ"""
+    outputs, expected = result["outputs"], baseline["outputs"]
+    diff = [i for i, (a, b) in enumerate(zip(outputs, expected)) if a != b]
+    diff += list(range(min(len(outputs), len(expected)), max(len(outputs), len(expected))))
+    return {"parity": 1 - len(diff) / max(len(expected), 1), "mismatches": diff}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="en_core_web_trf")
+    ap.add_argument("--targets", nargs="+", default=list(FIXTURES), choices=list(FIXTURES))
+    ap.add_argument("--rounds", type=int, default=3, help="per utterance latency rounds")
+    ap.add_argument("--repeat", type=int, default=5, help="corpus copies in the batch run")
+    ap.add_argument("--baseline", help="previous result file to check output parity against")
+    ap.add_argument("--output", help="write results to this file instead of stdout")
+    args = ap.parse_args()
+
+    import spacy
+
+    report = {"model": args.model,
+              "spacy": spacy.__version__,
+              "python": platform.python_version(),
+              "platform": platform.platform(),
+              "rounds": args.rounds,
+              "repeat": args.repeat,
+              "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "results": {}}
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    for name in args.targets:
+        result = run_isolated(name, args.model, args.rounds, args.repeat)
+        result.pop("target")
+        if name in baseline:
+            result["baseline"] = compare(result, baseline[name])
+        report["results"][name] = result
+        print(f"{name}: cold start {result['cold_start_s']}s, p50 {result['latency_ms']['p50']}ms, "
+              f"{result['throughput_per_sec']}/s, {result['peak_rss_mb']}MB", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,65 @@
+"""WindowedCorefResolver against whole document replace_corefs
+
+parity on the corpus, then time and peak RSS on growing documents, every
+document size and mode runs in a fresh process so peak RSS is not shared
+
+    python benchmarks/windows.py --model en_core_web_sm --window 8 --overlap 2 --sizes 1 4 16
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+
+from ovos_coreferee.corpus import COREF_SENTENCES
+from ovos_coreferee.parser import CorefereeParser
+from ovos_coreferee.window import WindowedCorefResolver
+
+
+def measure(model, window, overlap, size, windowed, queue):
+    parser = CorefereeParser(model=model, first_person_token="Miro", lazy=False)
+    resolver = WindowedCorefResolver(parser, window, overlap)
+    text = " ".join(COREF_SENTENCES * size)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if windowed:
+        resolver.replace_corefs(text, join_tok=" and ")
+    else:
+        parser.replace_corefs(text, join_tok=" and ")
+    queue.put({"sentences": size * len(COREF_SENTENCES),
+               "mode": "windowed" if windowed else "whole",
+               "seconds": round(time.perf_counter() - start, 3),
+               # ru_maxrss is in KB on linux
+               "peak_rss_growth_mb": round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss) / 1024, 1)})
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="en_core_web_trf")
+    ap.add_argument("--window", type=int, default=8)
+    ap.add_argument("--overlap", type=int, default=2)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16])
+    args = ap.parse_args()
+
+    parser = CorefereeParser(model=args.model, first_person_token="Miro", lazy=False)
+    resolver = WindowedCorefResolver(parser, args.window, args.overlap)
+    windowed = list(resolver.replace_corefs_batch(COREF_SENTENCES, join_tok=" and "))
+    mismatches = 0
+    for text, got in zip(COREF_SENTENCES, windowed):
+        expected = parser.replace_corefs(text, join_tok=" and ")
+        if got != expected:
+            mismatches += 1
+            print("MISMATCH:", text)
+            print("  whole:   ", expected)
+            print("  windowed:", got)
+    print(f"parity: {len(COREF_SENTENCES) - mismatches}/{len(COREF_SENTENCES)}")
+
+    ctx = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        for mode in (False, True):
+            queue = ctx.Queue()
+            p = ctx.Process(target=measure, args=(args.model, args.window, args.overlap,
+                                                  size, mode, queue))
+            p.start()
+            print(json.dumps(queue.get()))
+            p.join()
@@ -0,0 +1,36 @@
+"""throughput of CorefWorkerPool per worker count against the in-process parser
+
+    python benchmarks/workers.py --model en_core_web_sm --workers 1 2 4 --repeat 20
+"""
+import argparse
+import time
+
+from ovos_coreferee.corpus import COREF_SENTENCES
+from ovos_coreferee.parser import CorefereeParser
+from ovos_coreferee.workers import CorefWorkerPool
+
+
+def throughput(backend, texts, batch_size):
+    start = time.perf_counter()
+    n = sum(1 for _ in backend.replace_corefs_batch(texts, batch_size=batch_size))
+    return n / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", default="en_core_web_trf")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--repeat", type=int, default=10)
+    ap.add_argument("--batch-size", type=int, default=8)
+    args = ap.parse_args()
+
+    texts = COREF_SENTENCES * args.repeat
+
+    parser = CorefereeParser(model=args.model, lazy=False)
+    print(f"in-process: {throughput(parser, texts, args.batch_size):.1f} docs/sec")
+
+    for n in args.workers:
+        pool = CorefWorkerPool(workers=n, model=args.model)
+        pool.load()
+        print(f"{n} workers:  {throughput(pool, texts, args.batch_size):.1f} docs/sec")
+        pool.shutdown()
@@ -1,2 +1,3 @@
 from ovos_coreferee.parser import CorefereeParser
+from ovos_coreferee.result import CorefResult, Replacement
 from ovos_coreferee.triples import SpacyTriplesExtractor
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+def _resolve(fut: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    if fut.done():  # cancelled by the caller
+        return
+    if error is not None:
+        fut.set_exception(error)
+    else:
+        fut.set_result(result)
+
+
+class MicroBatcher:
+    """coalesce concurrent async requests into batches for a blocking batch function
+
+    requests sharing a key and arriving within `window` seconds of the first one
+    are sent together (at most max_batch at a time) to batch_fn(items, key),
+    which runs in an executor so the event loop is never blocked
+
+    with serial=True batches run one at a time, a spaCy pipeline must not be
+    called from several threads at once"""
+
+    def __init__(self, batch_fn: Callable[[List[Any], Hashable], List[Any]],
+                 window: float = 0.005, max_batch: int = 32,
+                 executor: Optional[Executor] = None, serial: bool = True) -> None:
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        # flush timer of the pending batch of each key
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock() if serial else None
+
+    async def submit(self, item: Any, key: Hashable = None) -> Any:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        full = None
+        with self._lock:
+            batch = self._pending.setdefault(key, [])
+            batch.append((item, fut))
+            if len(batch) >= self.max_batch:
+                full = self._pending.pop(key)
+                timer = self._timers.pop(key, None)
+                if timer is not None:
+                    # it would flush the next batch of this key early
+                    timer.cancel()
+            elif len(batch) == 1:
+                self._timers[key] = loop.call_later(self.window, self._flush, loop, key)
+        if full:
+            loop.run_in_executor(self.executor, self._run, key, full)
+        return await fut
+
+    def _flush(self, loop: asyncio.AbstractEventLoop, key: Hashable) -> None:
+        with self._lock:
+            self._timers.pop(key, None)
+            batch = self._pending.pop(key, None)
+        if batch:
+            loop.run_in_executor(self.executor, self._run, key, batch)
+
+    def _run(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        if self._run_lock is None:
+            self._run_batch(key, batch)
+        else:
+            with self._run_lock:
+                self._run_batch(key, batch)
+
+    def _run_batch(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            results = self.batch_fn([item for item, _ in batch], key)
+        except BaseException as e:
+            for _, fut in batch:
+                fut.get_loop().call_soon_threadsafe(_resolve, fut, None, e)
+            return
+        for (_, fut), result in zip(batch, results):
+            fut.get_loop().call_soon_threadsafe(_resolve, fut, result)
+
+
+async def iterate_in_thread(iterable_fn: Callable[..., Iterable], *args,
+                            maxsize: int = 64, **kwargs) -> AsyncIterator:
+    """consume a blocking iterator in a worker thread, yielding its items asynchronously"""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    done = object()
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable_fn(*args, **kwargs):
+                if stop.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(queue.put((item, None)), loop).result()
+        except BaseException as e:
+            asyncio.run_coroutine_threadsafe(queue.put((done, e)), loop).result()
+        else:
+            asyncio.run_coroutine_threadsafe(queue.put((done, None)), loop).result()
+
+    producer = loop.run_in_executor(None, produce)
+    try:
+        while True:
+            item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+        # unblock the producer if it is waiting on a full queue
+        while not queue.empty():
+            queue.get_nowait()
+        await producer
+
+
+class AsyncResolverMixin:
+    """replace_corefs_async for classes implementing replace_corefs_batch and select_model"""
+    batch_window: float = 0.005
+    max_batch: int = 32
+    # run one micro-batch at a time, backends calling nlp in this process need it
+    serial_batches: bool = True
+    _batcher: Optional[MicroBatcher] = None
+
+    def _solve_micro_batch(self, texts: List[str], key: Hashable) -> List[str]:
+        join_tok, model = key
+        return list(self.replace_corefs_batch(texts, join_tok=join_tok, model=model,
+                                              batch_size=self.max_batch))
+
+    async def replace_corefs_async(self, text: str, join_tok=None,
+                                   model: Optional[str] = None,
+                                   latency_budget: Optional[float] = None) -> str:
+        """non blocking replace_corefs, concurrent calls are coalesced into micro-batches"""
+        model = model or self.select_model(latency_budget)
+        if self._batcher is None:
+            self._batcher = MicroBatcher(self._solve_micro_batch,
+                                         window=self.batch_window,
+                                         max_batch=self.max_batch,
+                                         serial=self.serial_batches)
+        return await self._batcher.submit(text, key=(join_tok, model))
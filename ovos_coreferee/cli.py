@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+
+from ovos_coreferee.triples import SpacyTriplesExtractor
+
+
+def print_progress(stats: dict) -> None:
+    print(f"{stats['docs']} docs ({stats['docs_per_sec']:.1f}/s), "
+          f"{stats['triples']} triples ({stats['triples_per_sec']:.1f}/s), "
+          f"{stats['failed']} failed", file=sys.stderr)
+
+
+def main(argv=None) -> None:
+    """extract triples from a text file, one document per line"""
+    parser = argparse.ArgumentParser(prog="ovos-spacy-triples", description=main.__doc__)
+    parser.add_argument("input", help="text file with one document per line, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file, - for stdout")
+    parser.add_argument("-f", "--format", choices=("jsonl", "tsv"), default="jsonl")
+    parser.add_argument("-m", "--model", default="en_core_web_trf")
+    parser.add_argument("--first-person-token", default="USER")
+    parser.add_argument("--no-coref", action="store_true", help="do not solve coreferences")
+    parser.add_argument("--single-parse", action="store_true",
+                        help="extract triples from the coreferee parse instead of re-parsing")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-process", type=int, default=1)
+    parser.add_argument("--report-every", type=float, default=10.0,
+                        help="seconds between throughput reports on stderr")
+    parser.add_argument("--doc-cache", help="directory caching parsed documents between runs")
+    parser.add_argument("--doc-cache-mb", type=float, help="size limit of the doc cache")
+    parser.add_argument("--offline", action="store_true", help="never download models")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no throughput reports")
+    args = parser.parse_args(argv)
+
+    extractor = SpacyTriplesExtractor({"model": args.model,
+                                       "first_person_token": args.first_person_token,
+                                       "solve_coref": not args.no_coref,
+                                       "single_parse": args.single_parse,
+                                       "batch_size": args.batch_size,
+                                       "n_process": args.n_process,
+                                       "doc_cache": args.doc_cache,
+                                       "doc_cache_mb": args.doc_cache_mb,
+                                       "offline": args.offline})
+
+    source = (line.rstrip("\n") for line in sys.stdin) if args.input == "-" else args.input
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for idx, (s, r, o) in extractor.extract_triples_stream(
+                source, report_every=args.report_every,
+                progress=None if args.quiet else print_progress):
+            if args.format == "tsv":
+                out.write("\t".join((str(idx), s, r, o)).replace("\n", " ") + "\n")
+            else:
+                out.write(json.dumps({"doc": idx, "subject": s, "relation": r, "object": o},
+                                     ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
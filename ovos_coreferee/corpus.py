@@ -0,0 +1,66 @@
+"""sentences used by the __main__ demos and the benchmarks"""
+
+COREF_SENTENCES = [
+    "My name is Miro. I like beer",
+    "Barrack Obama was born in Hawaii. He was president of the United States and lived in the White House.",
+    "London has been a major settlement for two millennia. It was founded by the Romans, who named it Londinium.",
+    "He was very busy with his work, Peter had had enough of it. He and his wife decided they needed a holiday. They travelled to Spain because they loved the country very much.",
+    "My name is Miro. I like beer",
+    "The ring belongs to me!",
+    "The ring is mine! My birthday gift, my precious",
+    "I love my baby",
+    "I have a dog, a cat and a bird. we are a happy family",
+    "My neighbors have a cat. It has a bushy tail",
+    "My sister has a dog, She loves him!",
+    "Here is the book now take it",
+    "The sign was too far away for the boy to read it",
+    "Dog is man's best friend. It is always loyal",
+    "The girl said she would take the trash out",
+    "I voted for Bob because he is clear about his values. His ideas represent a majority of the nation. He is better than Alice",
+    "Jack von Doom is one of the top candidates in the elections. His ideas are unique compared to Bob's",
+    "Members voted for John because they see him as a good leader",
+    "Leaders around the world say they stand for peace",
+    "My neighbours just adopted a puppy. They care for it like a baby",
+    "I have many friends. They are an important part of my life",
+    "is the light turned on? turn it off",
+    "Turn off the light and change it to blue",
+    "call Mom. tell her to buy eggs. tell her to buy coffee. tell her to buy milk",
+    "call dad. tell him to buy bacon. tell him to buy coffee. tell him to buy beer",
+    "Chris is very handsome. He is Australian. Elsa lives in Arendelle. He likes her.",
+    "One night, Michael caught Tom in his office",
+    "One night, Michael caught Tom breaking into his office",
+    "Alice invited Marcia to go with her",
+    "The Martians invited the Venusians to go with them to Pluto",
+    "A short while later, Michael decided that he wanted to play a role in his son's life, and tried to get Lisa to marry him, but by this time, she wanted nothing to do with him. Around the same time, Lisa's son Tom had returned from Vietnam with a drug habit. One night, Michael caught Tom breaking into his office to steal drugs",
+    "Kevin invited Bob to go with him to his favorite fishing spot",
+    "Bob telephoned Jake to tell him that he lost the laptop.",
+    "Ana telephoned Alice to tell her that she lost the bus",
+    "The Martians told the Venusians that they used to have an ocean",
+    "Joe was talking to Bob and told him to go home because he was drunk",
+    "the dudes were talking with their enemies and they decided to avoid war",
+    "Janet has a husband, Sproule, and one son, Sam. A second child was stillborn in November 2009, causing her to miss Bristol City's match against Nottingham Forest. City manager Gary Johnson dedicated their equalising goal in the match to Janet, who had sent a message of support to her teammates.",
+    "Sproule has a wife, Janet, and one son, Sam. A second child was stillborn in November 2009, causing him to miss Bristol City's match against Nottingham Forest. City manager Gary Johnson dedicated their equalising goal in the match to Sproule, who had sent a message of support to his teammates.",
+    "Bob threatened to kill Alice to make her pay her debts",
+    "Alice invited Marcia to go with her to their favorite store",
+    "Adriana said she loves me!"
+]
+
+TRIPLES_SENTENCES = [
+    "Miro loves Dii.",
+    "Miro has a dog.",
+    "Miro is a software developer.",
+    "beer is nice",
+    "My name is Miro. I like beer",
+    "Mike is a nice guy",
+    "Chris was an asshole",
+    "Apple was founded in Cupertino in the year 1981.",
+    "Barrack Obama was born in Hawaii. He was president of the United States and lived in the White House.",
+    "London has been a major settlement for two millennia. It was founded by the Romans, who named it Londinium.",
+    "He was very busy with his work, Peter had had enough of it. He and his wife decided they needed a holiday. They travelled to Spain because they loved the country very much.",
+    "My name is Miro. I like beer",
+    "The ring belongs to me!",
+    "The ring is mine! My birthday gift, my precious",
+    "I love my baby",
+    "I have a dog, a cat and a bird. we are a happy family",
+    "Does Bob like coding? Yes he does"
+]
@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from spacy.tokens import Doc
+
+from ovos_coreferee.metrics import PipelineMetrics
+from ovos_coreferee.parser import CorefereeParser
+from ovos_coreferee.result import CorefResult
+
+# english third person pronouns -> what they can refer to
+# m/f: a person, n: a thing, p: a group
+THIRD_PERSON = {
+    "he": "m", "him": "m", "his": "m", "himself": "m",
+    "she": "f", "her": "f", "hers": "f", "herself": "f",
+    "it": "n", "its": "n", "itself": "n",
+    "they": "p", "them": "p", "their": "p", "theirs": "p", "themselves": "p"
+}
+
+# common nouns referring to people, proper nouns and PERSON entities are always animate
+ANIMATE_NOUNS = {
+    "mom", "mum", "mother", "dad", "father", "parent", "wife", "husband", "partner",
+    "sister", "brother", "son", "daughter", "kid", "child", "baby", "girl", "boy",
+    "man", "woman", "friend", "boss", "neighbor", "neighbour", "grandma", "grandpa",
+    "grandmother", "grandfather", "aunt", "uncle", "cousin", "teacher", "doctor"
+}
+
+# verbs whose subject is a dummy "it" ("it is raining")
+WEATHER_VERBS = {
+    "rain", "snow", "hail", "sleet", "drizzle", "pour", "thunder", "storm", "freeze"
+}
+
+
+def is_pleonastic(tok) -> bool:
+    """expletive "it" or "it" as the subject of a copula or weather verb
+    ("what time is it", "it is late", "it is raining"), never filled from history"""
+    if tok.dep_ == "expl":
+        return True
+    if tok.lower_ != "it" or tok.dep_ not in ("nsubj", "nsubjpass"):
+        return False
+    return tok.head.lemma_.lower() == "be" or tok.head.lemma_.lower() in WEATHER_VERBS
+
+
+class Antecedent:
+    """an entity mentioned in a previous turn that later pronouns can refer to"""
+    __slots__ = ("text", "animate", "plural")
+
+    def __init__(self, text: str, animate: bool = False, plural: bool = False) -> None:
+        self.text = text
+        self.animate = animate
+        self.plural = plural
+
+    def accepts(self, kind: str) -> bool:
+        if kind == "p":
+            return self.plural
+        if self.plural:
+            return False
+        if kind == "n":
+            return not self.animate
+        return self.animate
+
+    def __repr__(self) -> str:
+        return f"Antecedent({self.text!r}, animate={self.animate}, plural={self.plural})"
+
+
+class DialogueSession:
+    """antecedents of the last max_turns turns, most recent last"""
+    __slots__ = ("turns", "last_seen")
+
+    def __init__(self, max_turns: int) -> None:
+        self.turns: deque = deque(maxlen=max_turns)
+        self.last_seen = time.monotonic()
+
+    def find(self, kind: str) -> Optional[Antecedent]:
+        for turn in reversed(self.turns):
+            for antecedent in reversed(turn):
+                if antecedent.accepts(kind):
+                    return antecedent
+        return None
+
+
+class DialogueResolver:
+    """incremental coreference resolution across the turns of a dialogue
+
+    only the new utterance is parsed, pronouns coreferee could not resolve inside
+    the utterance are resolved against the entities of the last max_turns turns
+    of the same session. Sessions idle for session_ttl seconds are dropped, at
+    most max_sessions are kept. Per turn cost does not grow with the conversation
+
+    the pronoun rules are english only"""
+
+    def __init__(self, parser: CorefereeParser, max_turns: int = 5,
+                 session_ttl: float = 600, max_sessions: int = 1000) -> None:
+        self.parser = parser
+        self.max_turns = max_turns
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[str, DialogueSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_session(self, session_id: str) -> DialogueSession:
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            session = self.sessions.get(session_id)
+            if session is None:
+                # only a new session can push the table over its size limit
+                while self.sessions and len(self.sessions) >= self.max_sessions:
+                    self.sessions.popitem(last=False)
+                session = self.sessions[session_id] = DialogueSession(self.max_turns)
+            else:
+                self.sessions.move_to_end(session_id)
+            session.last_seen = now
+            return session
+
+    def _evict_expired(self, now: float) -> None:
+        # sessions are kept in last seen order, so stale ones are at the front
+        while self.sessions:
+            oldest = next(iter(self.sessions.values()))
+            if now - oldest.last_seen < self.session_ttl:
+                break
+            self.sessions.popitem(last=False)
+
+    def reset(self, session_id: str) -> None:
+        with self._lock:
+            self.sessions.pop(session_id, None)
+
+    def resolve(self, text: str, session_id: str = "default",
+                join_tok=None, update: bool = True) -> CorefResult:
+        return next(self.resolve_batch([text], session_id, join_tok, update))
+
+    def resolve_batch(self, texts: Iterable[str], session_id: str = "default",
+                      join_tok=None, update: bool = True,
+                      metrics: Optional[PipelineMetrics] = None) -> Iterator[CorefResult]:
+        """resolve alternatives of the same turn, e.g. ASR hypotheses
+
+        all of them see the same history, only the first one updates it"""
+        session = self.get_session(session_id)
+        model = self.parser.model
+        own_metrics = metrics is None
+        if own_metrics:
+            metrics = self.parser.new_metrics()
+        for idx, doc in enumerate(self.parser._pipe(texts, model, metrics=metrics)):
+            if metrics is None:
+                result, antecedents = self._resolve_doc(doc, session, join_tok, model)
+            else:
+                with metrics.timed("mapping"):
+                    result, antecedents = self._resolve_doc(doc, session, join_tok, model)
+                self.parser.count_doc(doc, len(result), metrics)
+            if update and idx == 0:
+                session.turns.append(antecedents)
+            yield result
+        if own_metrics:
+            self.parser.emit_metrics(metrics, model=model)
+
+    def _resolve_doc(self, doc: Doc, session: DialogueSession, join_tok=None,
+                     model: Optional[str] = None) -> tuple:
+        sources: Dict[int, int] = {}
+        mapping = self.parser.get_mapping(doc, join_tok, sources)
+        antecedents: List[Antecedent] = []
+        for tok in doc:
+            if tok.i not in mapping and tok.pos_ == "PRON" and tok.lower_ in THIRD_PERSON:
+                if is_pleonastic(tok):
+                    continue
+                antecedent = session.find(THIRD_PERSON[tok.lower_])
+                if antecedent is not None:
+                    mapping[tok.i] = antecedent.text
+                    sources[tok.i] = -1
+                    # mentioning it again keeps the entity salient for the next turn
+                    antecedents.append(antecedent)
+            elif tok.pos_ in ("NOUN", "PROPN") and tok.dep_ != "compound":
+                antecedents.append(self.make_antecedent(tok, mapping.get(tok.i)))
+        result = self.parser.result_from_doc(doc, join_tok, model, mapping, sources)
+        return result, antecedents
+
+    @staticmethod
+    def make_antecedent(tok, resolved: Optional[str] = None) -> Antecedent:
+        animate = tok.ent_type_ == "PERSON" or \
+                  (tok.pos_ == "PROPN" and tok.ent_type_ in ("", "PERSON")) or \
+                  tok.lemma_.lower() in ANIMATE_NOUNS
+        plural = "Plur" in tok.morph.get("Number")
+        return Antecedent(resolved or tok.text, animate, plural)
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc, DocBin
+from srsly.msgpack.exceptions import UnpackException
+
+from ovos_coreferee.parser import COREF_CHAINS_KEY
+
+# errors DocBin raises on a truncated or corrupted chunk file
+CORRUPT_CHUNK_ERRORS = (OSError, ValueError, IndexError, KeyError, TypeError,
+                        zlib.error, UnpackException)
+
+
+def pipeline_digest(nlp: Language, disable: Sequence[str] = ()) -> str:
+    """hash of everything that changes a parse: model name and version,
+    spaCy version, the full pipeline config and the disabled components"""
+    meta = nlp.meta
+    data = {"model": f"{meta.get('lang')}_{meta.get('name')}",
+            "version": meta.get("version"),
+            "spacy": spacy.__version__,
+            "config": nlp.config.to_str(),
+            "disable": sorted(disable)}
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class DocCache:
+    """persistent, content addressed cache of parsed Docs
+
+    docs are keyed by the hash of their text and of the pipeline that parsed them,
+    and written in chunks of chunk_size docs to DocBin files next to a sqlite index.
+    Coreference chains are kept (the plain lists stored by the coref_chains_export
+    component), other user_data, e.g. coreferee's extension objects, is not
+
+    chunk files are memory mapped and decoded whole, the last max_chunks decoded
+    chunks are kept in memory, so re-reading a corpus in order decodes every chunk
+    once. When the files exceed max_mb the least recently read chunks are deleted"""
+
+    def __init__(self, path: str, max_mb: Optional[float] = None,
+                 chunk_size: int = 256, max_chunks: int = 4) -> None:
+        self.path = os.path.expanduser(path)
+        os.makedirs(self.path, exist_ok=True)
+        self.max_mb = max_mb
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # pipeline digests per nlp object, dropped with it so a new pipeline
+        # can never pick up the digest of a garbage collected one
+        self._digests: "weakref.WeakKeyDictionary[Language, Dict[tuple, str]]" = \
+            weakref.WeakKeyDictionary()
+        self._decoded: "OrderedDict[int, List[Doc]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(os.path.join(self.path, "index.sqlite"),
+                                   check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS docs "
+                         "(key TEXT PRIMARY KEY, chunk INTEGER, pos INTEGER)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS chunks "
+                         "(id INTEGER PRIMARY KEY AUTOINCREMENT, size INTEGER, last_used REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS docs_chunk ON docs (chunk)")
+        self._db.commit()
+
+    def make_key(self, text: str, nlp: Language, disable: Sequence[str] = ()) -> str:
+        digests = self._digests.setdefault(nlp, {})
+        # pipes can be added to a loaded pipeline, that changes its config
+        config = (tuple(nlp.pipe_names), tuple(disable))
+        if config not in digests:
+            digests[config] = pipeline_digest(nlp, disable)
+        return hashlib.sha1(f"{digests[config]}\0{text}".encode("utf-8")).hexdigest()
+
+    def _chunk_path(self, chunk: int) -> str:
+        return os.path.join(self.path, f"chunk-{chunk:08d}.spacy")
+
+    def _load_chunk(self, chunk: int, vocab) -> List[Doc]:
+        docs = self._decoded.get(chunk)
+        if docs is None:
+            with open(self._chunk_path(chunk), "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                docs = list(DocBin(store_user_data=True).from_bytes(mm).get_docs(vocab))
+            self._decoded[chunk] = docs
+            while len(self._decoded) > self.max_chunks:
+                self._decoded.popitem(last=False)
+            self._db.execute("UPDATE chunks SET last_used = ? WHERE id = ?",
+                             (time.time(), chunk))
+            self._db.commit()
+        else:
+            self._decoded.move_to_end(chunk)
+        return docs
+
+    def get(self, key: str, vocab) -> Optional[Doc]:
+        with self._lock:
+            row = self._db.execute("SELECT chunk, pos FROM docs WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            try:
+                doc = self._load_chunk(row[0], vocab)[row[1]]
+            except CORRUPT_CHUNK_ERRORS:  # deleted or corrupted chunk
+                self._drop_chunk(row[0])
+                self.misses += 1
+                return None
+            self.hits += 1
+            return doc
+
+    def put_many(self, items: Sequence[tuple]) -> None:
+        """store (key, doc) pairs as a single chunk"""
+        if not items:
+            return
+        docbin = DocBin(store_user_data=True)
+        for _, doc in items:
+            user_data = doc.user_data
+            # only the plain coref chains survive serialization
+            doc.user_data = {COREF_CHAINS_KEY: user_data[COREF_CHAINS_KEY]} \
+                if COREF_CHAINS_KEY in user_data else {}
+            try:
+                docbin.add(doc)
+            finally:
+                doc.user_data = user_data
+        data = docbin.to_bytes()
+        with self._lock:
+            chunk = self._db.execute("INSERT INTO chunks (size, last_used) VALUES (?, ?)",
+                                     (len(data), time.time())).lastrowid
+            with open(self._chunk_path(chunk), "wb") as f:
+                f.write(data)
+            self._db.executemany("INSERT OR REPLACE INTO docs (key, chunk, pos) VALUES (?, ?, ?)",
+                                 [(key, chunk, pos) for pos, (key, _) in enumerate(items)])
+            self._db.commit()
+            self.enforce_budget()
+
+    def _drop_chunk(self, chunk: int) -> None:
+        self._decoded.pop(chunk, None)
+        self._db.execute("DELETE FROM docs WHERE chunk = ?", (chunk,))
+        self._db.execute("DELETE FROM chunks WHERE id = ?", (chunk,))
+        self._db.commit()
+        try:
+            os.remove(self._chunk_path(chunk))
+        except FileNotFoundError:
+            pass
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM chunks").fetchone()[0]
+
+    def enforce_budget(self) -> None:
+        """delete the least recently read chunks until the cache fits in max_mb"""
+        if not self.max_mb:
+            return
+        with self._lock:
+            budget = self.max_mb * 1024 * 1024
+            total = self.size_bytes
+            for chunk, size in self._db.execute(
+                    "SELECT id, size FROM chunks ORDER BY last_used").fetchall():
+                if total <= budget:
+                    break
+                self._drop_chunk(chunk)
+                self.evictions += 1
+                total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            for chunk, in self._db.execute("SELECT id FROM chunks").fetchall():
+                self._drop_chunk(chunk)
+
+    def close(self) -> None:
+        with self._lock:
+            self._decoded.clear()
+            self._db.close()
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            docs = self._db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        return {"docs": docs, "size_mb": round(self.size_bytes / 1024 / 1024, 1),
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def pipe(self, texts: Iterable[str], nlp: Language,
+             parse: Optional[Callable[[Iterable[str]], Iterable[Doc]]] = None,
+             disable: Sequence[str] = ()) -> Iterator[Doc]:
+        """like nlp.pipe(texts, disable=disable), cached docs are never sent to the model
+
+        parse(texts) replaces nlp.pipe when given (e.g. to set batch_size / n_process),
+        it must parse with the same nlp and disabled components. Docs are streamed
+        in input order, new parses are written every chunk_size docs"""
+        parse = parse or (lambda t: nlp.pipe(t, disable=disable))
+        pending = deque()  # (key, cached doc or None) in input order
+        new = []
+
+        def misses():
+            for text in texts:
+                key = self.make_key(text, nlp, disable)
+                doc = self.get(key, nlp.vocab)
+                pending.append((key, doc))
+                if doc is None:
+                    yield text
+
+        try:
+            for doc in parse(misses()):
+                while pending[0][1] is not None:
+                    yield pending.popleft()[1]
+                key, _ = pending.popleft()
+                new.append((key, doc))
+                if len(new) >= self.chunk_size:
+                    self.put_many(new)
+                    new = []
+                yield doc
+            while pending:
+                yield pending.popleft()[1]
+        finally:
+            self.put_many(new)
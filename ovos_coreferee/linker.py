@@ -0,0 +1,226 @@
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+
+# file layout: header, (count + 1) record offsets, records sorted by alias
+# every record is "alias\tentity_id\tentity_type" utf-8, aliases are normalized
+MAGIC = b"OVEL0001"
+HEADER = struct.Struct("<8sII")  # magic, count, max_words
+OFFSET = struct.Struct("<Q")
+LINKER_PIPE = "local_entity_linker"
+
+
+def normalize_alias(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def read_gazetteer(path: Union[str, os.PathLike]) -> Iterable[Tuple[str, str, str]]:
+    """(alias, entity id, entity type) rows of a tsv file, the type column is optional"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            cols = line.split("\t")
+            if len(cols) < 2:
+                print(f"WARNING - skipping malformed gazetteer line: {line!r}")
+                continue
+            yield cols[0], cols[1], cols[2] if len(cols) > 2 else ""
+
+
+def build_alias_index(rows: Union[str, os.PathLike, Iterable[Tuple[str, str, str]]],
+                      path: Union[str, os.PathLike]) -> int:
+    """write the alias index read by AliasIndex, returns the number of aliases
+
+    rows are (alias, entity id, entity type) tuples or a gazetteer tsv file,
+    the first entity given for an alias wins"""
+    if isinstance(rows, (str, os.PathLike)):
+        rows = read_gazetteer(rows)
+    aliases: Dict[bytes, bytes] = {}
+    max_words = 1
+    for alias, entity_id, entity_type in rows:
+        alias = normalize_alias(alias)
+        if not alias:
+            continue
+        key = alias.encode("utf-8")
+        if key not in aliases:
+            aliases[key] = f"{entity_id}\t{entity_type}".encode("utf-8")
+            max_words = max(max_words, alias.count(" ") + 1)
+
+    records = [k + b"\t" + v for k, v in sorted(aliases.items())]
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records), max_words))
+        offset = 0
+        for record in records:
+            f.write(OFFSET.pack(offset))
+            offset += len(record)
+        f.write(OFFSET.pack(offset))
+        for record in records:
+            f.write(record)
+    return len(records)
+
+
+class AliasIndex:
+    """memory mapped, read only alias -> (entity id, entity type) index
+
+    the file is paged in by the OS on demand, so opening it is instant and
+    its memory is shared between processes"""
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.max_words = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an alias index")
+        self._offsets = HEADER.size
+        self._records = self._offsets + (self.count + 1) * OFFSET.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    # mmaps can not be pickled, spaCy sends pipelines to worker processes with n_process > 1
+    def __getstate__(self) -> dict:
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["path"])
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def _record(self, idx: int) -> bytes:
+        start, = OFFSET.unpack_from(self._mm, self._offsets + idx * OFFSET.size)
+        end, = OFFSET.unpack_from(self._mm, self._offsets + (idx + 1) * OFFSET.size)
+        return self._mm[self._records + start:self._records + end]
+
+    def _alias(self, idx: int) -> bytes:
+        record = self._record(idx)
+        return record[:record.index(b"\t")]
+
+    def _search(self, key: bytes, lo: int = 0) -> int:
+        """first position >= lo whose alias is not smaller than key"""
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._alias(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup(self, alias: str) -> Optional[Tuple[str, str]]:
+        return self.lookup_many([alias]).get(normalize_alias(alias))
+
+    def lookup_many(self, aliases: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """normalized alias -> (entity id, entity type) for the aliases in the index
+
+        queries are sorted so each search starts where the previous one ended"""
+        hits = {}
+        lo = 0
+        for alias in sorted({normalize_alias(a).encode("utf-8") for a in aliases}):
+            lo = self._search(alias, lo)
+            if lo >= self.count:
+                break
+            record = self._record(lo)
+            key, entity_id, entity_type = record.split(b"\t", 2)
+            if key == alias:
+                hits[alias.decode("utf-8")] = (entity_id.decode("utf-8"), entity_type.decode("utf-8"))
+        return hits
+
+
+class LocalEntityLinker:
+    """links doc.ents and gazetteer aliases found in the text to entity ids (Span.kb_id_)
+
+    a drop in for dbpedia_spotlight that needs no network, every candidate span
+    of a doc is looked up in a single batch"""
+
+    def __init__(self, nlp: Language, name: str, index_path: str,
+                 max_words: Optional[int] = None, overwrite_ents: bool = False) -> None:
+        self.name = name
+        self.index = AliasIndex(index_path)
+        self.max_words = max_words or self.index.max_words
+        # only keep linked entities, like dbpedia_spotlight does
+        self.overwrite_ents = overwrite_ents
+        self.stats = {"docs": 0, "lookups": 0, "hits": 0, "seconds": 0.0}
+
+    @property
+    def latency_ms(self) -> float:
+        """average lookup time per doc"""
+        return self.stats["seconds"] * 1000 / max(self.stats["docs"], 1)
+
+    def candidates(self, doc: Doc) -> Dict[Tuple[int, int], str]:
+        """(start, end) -> text of the entities and of the token ngrams outside them"""
+        candidates = {(ent.start, ent.end): ent.text for ent in doc.ents}
+        covered = {i for ent in doc.ents for i in range(ent.start, ent.end)}
+        for start, tok in enumerate(doc):
+            if start in covered or tok.is_punct or tok.is_space:
+                continue
+            for end in range(start + 1, min(start + self.max_words, len(doc)) + 1):
+                last = doc[end - 1]
+                if end - 1 in covered:
+                    break
+                if last.is_punct or last.is_space or (end == start + 1 and tok.is_stop):
+                    continue
+                candidates[(start, end)] = doc[start:end].text
+        return candidates
+
+    def __call__(self, doc: Doc) -> Doc:
+        start_time = time.perf_counter()
+        candidates = self.candidates(doc)
+        hits = self.index.lookup_many(candidates.values())
+
+        ents = []
+        for ent in doc.ents:
+            hit = hits.get(normalize_alias(ent.text))
+            if hit is not None:
+                ents.append(Span(doc, ent.start, ent.end, label=ent.label_, kb_id=hit[0]))
+            elif not self.overwrite_ents:
+                ents.append(ent)
+        covered = {i for ent in doc.ents for i in range(ent.start, ent.end)}
+        # longest alias first, left to right
+        start = 0
+        while start < len(doc):
+            if start not in covered:
+                for end in range(min(start + self.max_words, len(doc)), start, -1):
+                    text = candidates.get((start, end))
+                    hit = hits.get(normalize_alias(text)) if text is not None else None
+                    if hit is not None:
+                        ents.append(Span(doc, start, end, label=hit[1] or "ENTITY", kb_id=hit[0]))
+                        start = end - 1
+                        break
+            start += 1
+        doc.ents = sorted(ents, key=lambda s: s.start)
+
+        self.stats["docs"] += 1
+        self.stats["lookups"] += len(candidates)
+        self.stats["hits"] += len(hits)
+        self.stats["seconds"] += time.perf_counter() - start_time
+        return doc
+
+
+@Language.factory(LINKER_PIPE,
+                  default_config={"index_path": None, "max_words": None, "overwrite_ents": False})
+def make_local_entity_linker(nlp: Language, name: str, index_path: str,
+                             max_words: Optional[int], overwrite_ents: bool) -> LocalEntityLinker:
+    if not index_path:
+        raise ValueError("local_entity_linker needs an index_path, "
+                         "see ovos_coreferee.linker.build_alias_index")
+    return LocalEntityLinker(nlp, name, index_path, max_words, overwrite_ents)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="build an alias index for local_entity_linker")
+    parser.add_argument("gazetteer", help="tsv file, alias<TAB>entity id[<TAB>entity type] per line")
+    parser.add_argument("index", help="output index file")
+    args = parser.parse_args()
+    print(f"{build_alias_index(args.gazetteer, args.index)} aliases written to {args.index}")
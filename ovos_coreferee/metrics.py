@@ -0,0 +1,71 @@
+import time
+from contextlib import contextmanager
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+from spacy.language import Language
+from spacy.tokens import Doc
+
+# receives PipelineMetrics.to_dict() once per call of an instrumented method
+MetricsCallback = Callable[[dict], None]
+
+
+class PipelineMetrics:
+    """seconds per stage and counters of one call, e.g. a replace_corefs_batch
+
+    stages are the spaCy components (plus "tokenizer") and the rule passes.
+    scoped() views share the same dicts with a name prefix, so nested passes,
+    e.g. the coref and triples parses of the triples extractor, report together"""
+    __slots__ = ("timings", "counters", "prefix")
+
+    def __init__(self, prefix: str = "", timings: Optional[Dict[str, float]] = None,
+                 counters: Optional[Dict[str, int]] = None) -> None:
+        self.prefix = prefix
+        self.timings: Dict[str, float] = {} if timings is None else timings
+        self.counters: Dict[str, int] = {} if counters is None else counters
+
+    def scoped(self, prefix: str) -> "PipelineMetrics":
+        return PipelineMetrics(f"{self.prefix}{prefix}.", self.timings, self.counters)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        stage = self.prefix + stage
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        name = self.prefix + name
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def to_dict(self) -> dict:
+        return {"timings_ms": {k: round(v * 1000, 3) for k, v in self.timings.items()},
+                "counters": dict(self.counters)}
+
+
+def timed_pipe(nlp: Language, texts: Iterable[str], metrics: PipelineMetrics,
+               disable: Sequence[str] = (), batch_size: int = 32) -> Iterator[Doc]:
+    """nlp.pipe(texts, disable=disable) in this process, running one component at a time
+    over each batch so the time spent in every component can be measured"""
+    texts = iter(texts)
+    while True:
+        batch = list(islice(texts, batch_size))
+        if not batch:
+            return
+        with metrics.timed("tokenizer"):
+            docs = [nlp.make_doc(text) for text in batch]
+        for name, proc in nlp.pipeline:
+            if name in disable:
+                continue
+            with metrics.timed(name):
+                if hasattr(proc, "pipe"):
+                    docs = list(proc.pipe(docs, batch_size=batch_size))
+                else:
+                    docs = [proc(doc) for doc in docs]
+        metrics.count("docs", len(docs))
+        yield from docs
@@ -1,36 +1,184 @@
-from typing import Optional, List
+import asyncio
+import time
+from typing import Optional, List, Iterable
 
 from ovos_plugin_manager.coreference import CoreferenceSolverEngine
 from ovos_plugin_manager.templates.transformers import UtteranceTransformer
 
-from ovos_coreferee.parser import CorefereeParser
+from ovos_coreferee.cache import get_shared_cache
+from ovos_coreferee.dialogue import DialogueResolver
+from ovos_coreferee.metrics import MetricsCallback, PipelineMetrics
+from ovos_coreferee.parser import CorefereeParser, may_need_resolution
+from ovos_coreferee.registry import ParserRegistry
+from ovos_coreferee.workers import CorefWorkerPool
 
 
 class CorefereeSolver(CoreferenceSolverEngine):
-    parser: CorefereeParser = None
 
-    @classmethod
-    def solve_corefs(cls, text, lang="en"):
-        if cls.parser is None:
-            cls.parser = CorefereeParser()
-        return cls.parser.replace_corefs(text)
+    def __init__(self, config=None):
+        super().__init__(config)
+        # model per language, the least recently used are unloaded over the memory budget
+        # number of worker processes per language, 0 runs the model in this process
+        self.registry = ParserRegistry(models=self.config.get("models"),
+                                       memory_budget_mb=self.config.get("memory_budget_mb"),
+                                       workers=self.config.get("workers", 0),
+                                       cache=get_shared_cache())
+
+    def solve_corefs(self, text, lang="en"):
+        if not self.registry.is_supported(lang):
+            return text
+        with self.registry.use(lang) as parser:
+            return parser.replace_corefs(text)
 
 
 class CorefereeNormalizerPlugin(UtteranceTransformer):
     """plugin to normalize utterances by replacing coreferences
     this helps intent parsers"""
 
-    def __init__(self, name="ovos-coreferee-normalizer", priority=1):
-        super().__init__(name, priority)
-        self.parser = CorefereeParser()
+    def __init__(self, name="ovos-coreferee-normalizer", priority=1, config=None):
+        super().__init__(name, priority, config)
+        cache = None
+        cache_cfg = self.config.get("cache", {})
+        if cache_cfg is not False:
+            cache = get_shared_cache(maxsize=cache_cfg.get("maxsize", 1024),
+                                     ttl=cache_cfg.get("ttl", 3600))
+        parser_kwargs = dict(model=self.config.get("model", "en_core_web_trf"),
+                             offline=self.config.get("offline", False),
+                             fallback_models=self.config.get("fallback_models"),
+                             latency_budget=self.config.get("latency_budget"),
+                             profile=self.config.get("profile", "full"),
+                             profile_mode=self.config.get("profile_mode", "disable"))
+        if self.config.get("workers"):
+            self.parser = CorefWorkerPool(workers=self.config["workers"],
+                                          max_pending=self.config.get("max_pending", 64),
+                                          timeout=self.config.get("timeout", 30),
+                                          cache=cache, **parser_kwargs)
+            if self.config.get("warmup", True):
+                self.parser.warmup()
+        else:
+            # model loading is deferred to a background thread so plugin loading does not block
+            self.parser = CorefereeParser(cache=cache,
+                                          warmup=self.config.get("warmup", True),
+                                          **parser_kwargs)
+
+        # skip utterances without pronouns, the word list is english only
+        self.prefilter = self.config.get("prefilter",
+                                         parser_kwargs["model"].startswith("en_"))
+
+        # resolve pronouns against the previous turns of the same session
+        self.dialogue: Optional[DialogueResolver] = None
+        dialogue_cfg = self.config.get("dialogue")
+        if dialogue_cfg:
+            dialogue_cfg = dialogue_cfg if isinstance(dialogue_cfg, dict) else {}
+            if isinstance(self.parser, CorefereeParser):
+                self.dialogue = DialogueResolver(self.parser,
+                                                 max_turns=dialogue_cfg.get("max_turns", 5),
+                                                 session_ttl=dialogue_cfg.get("session_ttl", 600),
+                                                 max_sessions=dialogue_cfg.get("max_sessions", 1000))
+            else:
+                print("WARNING - dialogue context is not supported with worker processes")
+
+        # per stage timings and counters, added to the context as "coref_metrics"
+        self.metrics = self.config.get("metrics", False)
+        # called with the same dict after every transform, e.g. to export it
+        self.metrics_callback: Optional[MetricsCallback] = None
+
+    @staticmethod
+    def _session_id(context: dict) -> str:
+        session = context.get("session") or {}
+        return session.get("session_id", "default") if isinstance(session, dict) else "default"
 
     def transform(self, utterances: List[str],
                   context: Optional[dict] = None) -> (list, dict):
 
+        context = context or {}
+        metrics = self._new_metrics()
+        if self.dialogue is not None:
+            results = self.dialogue.resolve_batch(utterances, self._session_id(context),
+                                                  metrics=metrics)
+            solved = [r.resolved for r in results]
+            self._report(metrics, self.parser.model, context)
+            return self._merge(utterances, solved, self.parser.model, context)
+
+        model = self.parser.select_model(context.get("coref_latency_budget"))
+        keys, todo = self._plan(utterances, context)
+        if metrics is None:
+            solved = dict(zip(todo, self.parser.replace_corefs_batch(todo, model=model)))
+        else:
+            # worker processes can not report their stages, only the total is timed
+            kwargs = {"metrics": metrics} if isinstance(self.parser, CorefereeParser) else {}
+            with metrics.timed("total"):
+                solved = dict(zip(todo, self.parser.replace_corefs_batch(todo, model=model,
+                                                                         **kwargs)))
+            metrics.count("utterances", len(utterances))
+            metrics.count("duplicates", context["coref_duplicates"])
+            metrics.count("skipped", context["coref_skipped"])
+            self._report(metrics, model, context)
+        return self._merge(utterances, [solved.get(k, u) for u, k in zip(utterances, keys)],
+                           model, context)
+
+    def _new_metrics(self) -> Optional[PipelineMetrics]:
+        if not self.metrics and self.metrics_callback is None:
+            return None
+        return PipelineMetrics()
+
+    def _report(self, metrics: Optional[PipelineMetrics], model: Optional[str],
+                context: dict) -> None:
+        if metrics is None:
+            return
+        data = metrics.to_dict()
+        data["model"] = model
+        if self.metrics:
+            context["coref_metrics"] = data
+        if self.metrics_callback is not None:
+            self.metrics_callback(data)
+
+    async def transform_async(self, utterances: List[str],
+                              context: Optional[dict] = None) -> (list, dict):
+        """non blocking transform, concurrent calls share micro-batches"""
+        context = context or {}
+        if self.dialogue is not None:
+            # dialogue turns must be resolved in order, so they are not micro-batched
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.transform, utterances, context)
+        model = self.parser.select_model(context.get("coref_latency_budget"))
+        keys, todo = self._plan(utterances, context)
+        metrics = self._new_metrics()
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self.parser.replace_corefs_async(k, model=model)
+                                         for k in todo))
+        if metrics is not None:
+            # micro-batches are shared with other requests, only the total is timed
+            metrics.add_time("total", time.perf_counter() - start)
+            metrics.count("utterances", len(utterances))
+            metrics.count("duplicates", context["coref_duplicates"])
+            metrics.count("skipped", context["coref_skipped"])
+            self._report(metrics, model, context)
+        solved = dict(zip(todo, results))
+        return self._merge(utterances, [solved.get(k, u) for u, k in zip(utterances, keys)],
+                           model, context)
+
+    def _plan(self, utterances: List[str], context: dict) -> (list, list):
+        """normalized key per utterance and the unique keys that need the model
+
+        ASR alternatives often only differ in spacing and most utterances have
+        no pronouns at all, replace_corefs can not change those"""
+        keys = [" ".join(u.split()) for u in utterances]
+        unique = list(dict.fromkeys(keys))
+        todo = [k for k in unique if not self.prefilter or may_need_resolution(k)]
+        context["coref_duplicates"] = len(utterances) - len(unique)
+        context["coref_skipped"] = len(unique) - len(todo)
+        return keys, todo
+
+    @staticmethod
+    def _merge(utterances: List[str], solved: Iterable[str],
+               model: Optional[str], context: dict) -> (list, dict):
         norm = []
-        for u in utterances:
+        for u, s in zip(utterances, solved):
             norm.append(u)
-            norm.append(self.parser.replace_corefs(u))
+            norm.append(s)
+        if model:
+            context["coref_model"] = model
 
         # this deduplicates the list while keeping order
         return list(dict.fromkeys(norm)), context
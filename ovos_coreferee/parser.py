@@ -1,164 +1,496 @@
-from typing import Dict
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-import spacy
-from spacy.cli import download
+from spacy.language import Language
+from spacy.tokens import Doc
 
+from ovos_coreferee.aio import AsyncResolverMixin
+from ovos_coreferee.cache import CorefCache
+from ovos_coreferee.metrics import MetricsCallback, PipelineMetrics, timed_pipe
+from ovos_coreferee.pool import ensure_model, get_model_pool
+from ovos_coreferee.result import CorefResult, Replacement
+from ovos_coreferee.tiers import TierSelectionMixin
 
-class CorefereeParser:
+# plain (msgpack friendly) copy of the coreferee chains, stored in doc.user_data
+# as a list of chains, each chain a list of mentions, each mention a list of token indexes
+COREF_CHAINS_KEY = "coref_chains"
+
+# components coreferee resolution adds on top of the model
+COREF_PIPES: List[str] = ["coreferee", "coref_chains_export"]
+
+# spaCy components each use-case can skip
+PIPELINE_PROFILES: Dict[str, List[str]] = {
+    "full": [],
+    # replace_corefs only reads pos/dep/morph/lemma, coreferee uses entity types
+    # as one of several cues, compare outputs with benchmarks/profiles.py
+    "coref": ["ner"],
+    # NER preps and SVOs need the tagger, parser, lemmatizer and ner,
+    # but not the coref chains when parsing already resolved text
+    "triples": ["coreferee", "coref_chains_export"]
+}
+
+# words replace_corefs acts on, text without any of them is returned unchanged
+# except for nouns coreferee links to other nouns ("the country" -> "Spain")
+RESOLVABLE_WORDS = frozenset({
+    "i", "me", "my", "mine", "we", "us", "our", "ours", "who",
+    "he", "him", "his", "himself", "she", "her", "hers", "herself",
+    "it", "its", "itself", "they", "them", "their", "theirs", "themselves"
+})
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def may_need_resolution(text: str) -> bool:
+    """cheap check for pronouns and first person words, english only"""
+    return any(w in RESOLVABLE_WORDS for w in _WORD_RE.findall(text.lower()))
+
+
+@Language.component("coref_chains_export")
+def export_coref_chains(doc: Doc, strip: bool = False) -> Doc:
+    """copy coreferee chains into doc.user_data as plain lists
+
+    with strip=True the coreferee extension objects are dropped, they can not be
+    serialized and would break nlp.pipe(n_process > 1)"""
+    doc.user_data[COREF_CHAINS_KEY] = [[list(m.token_indexes) for m in chain]
+                                       for chain in doc._.coref_chains]
+    if strip:
+        for k in [k for k in doc.user_data
+                  if isinstance(k, tuple) and k and k[0] == "._."]:
+            doc.user_data.pop(k)
+    return doc
+
+
+class CorefereeParser(TierSelectionMixin, AsyncResolverMixin):
     """Extract semantic triples for knowledge graph construction."""
 
     def __init__(self, model="en_core_web_trf",
-                 first_person_token="SPEAKER") -> None:
+                 first_person_token="SPEAKER",
+                 cache: Optional[CorefCache] = None,
+                 lazy: bool = True,
+                 offline: bool = False,
+                 warmup: bool = False,
+                 fallback_models: Optional[List[str]] = None,
+                 latency_budget: Optional[float] = None,
+                 probe_interval: int = 50,
+                 profile: str = "full",
+                 profile_mode: str = "disable",
+                 extra_pipes: Sequence[str] = (),
+                 preserve_whitespace: bool = False,
+                 metrics_callback: Optional[MetricsCallback] = None) -> None:
         self.first_person = first_person_token
-        """Load spaCy model."""
-        if not spacy.util.is_package(model):
-            download(model)
-        if model == "en_core_web_trf":
-            # EXTRA MODEL ALSO NEEDED
-            if not spacy.util.is_package("en_core_web_lg"):
-                download("en_core_web_lg")
-        self.nlp = spacy.load(model)
-        self.nlp.add_pipe("coreferee")
-
-    def replace_corefs(self, text: str, join_tok=None) -> str:
-        doc = self.nlp(text)
-        # debug print coref
-        # doc._.coref_chains.print()
+        # rebuild output with the original spacing instead of the legacy space separated tokens
+        self.preserve_whitespace = preserve_whitespace
+        self._init_tiers(model, fallback_models, latency_budget, probe_interval)
+        # "disable" keeps the skipped components loaded so the same pipeline can
+        # serve other profiles, "exclude" does not load them at all to save memory
+        if profile not in PIPELINE_PROFILES:
+            raise ValueError(f"unknown pipeline profile: {profile}")
+        if set(COREF_PIPES) & set(PIPELINE_PROFILES[profile]):
+            raise ValueError(f"pipeline profile {profile} can not resolve coreferences")
+        if profile_mode not in ("disable", "exclude"):
+            raise ValueError(f"unknown profile mode: {profile_mode}")
+        self.profile = profile
+        self.profile_mode = profile_mode
+        self.disabled = list(PIPELINE_PROFILES[profile])
+        self.excluded = self.disabled if profile_mode == "exclude" else []
+        # components added after loading, models are shared through the process wide
+        # model pool with every user asking for the same model, exclusions and pipes
+        self.pipes = COREF_PIPES + list(extra_pipes)
+        self.cache = cache
+        self.offline = offline
+        # seconds spent per loading stage, filled when the model is loaded
+        self.load_timings: Dict[str, float] = {}
+        self._models: Dict[str, Language] = {}
+        self._load_lock = threading.Lock()
+        self._warming = set()
+        # called with per stage timings and counters after every call, None disables
+        # instrumentation, components are then run by nlp.pipe as usual
+        self.metrics_callback = metrics_callback
+        if not lazy:
+            self.load()
+        elif warmup:
+            self.warmup()
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._models)
+
+    @property
+    def memory_bytes(self) -> int:
+        """RSS growth caused by loading the models, 0 if unknown or not loaded
+
+        models shared with other users of the model pool are counted in full"""
+        pool = get_model_pool()
+        return sum(pool.memory.get(pool.make_key(m, self.excluded, self.pipes), 0)
+                   for m in list(self._models))
+
+    @property
+    def nlp(self) -> Language:
+        return self.get_nlp()
+
+    def get_nlp(self, model: Optional[str] = None) -> Language:
+        model = model or self.model
+        nlp = self._models.get(model)
+        if nlp is None:
+            nlp = self.load(model)
+        return nlp
+
+    def load(self, model: Optional[str] = None) -> Language:
+        """Load spaCy model, blocks until ready"""
+        model = model or self.model
+        with self._load_lock:
+            if model in self._models:
+                return self._models[model]
+            timings = {}
+            start = time.perf_counter()
+            if model == "en_core_web_trf":
+                # EXTRA MODEL ALSO NEEDED
+                ensure_model("en_core_web_lg", self.offline, timings)
+            pool = get_model_pool()
+            nlp = pool.acquire(model, self.excluded, self.pipes, self.offline)
+            timings.update(pool.load_timings.get(pool.make_key(model, self.excluded, self.pipes), {}))
+            timings["acquire"] = time.perf_counter() - start
+            if model == self.model:
+                self.load_timings = timings
+            self._models[model] = nlp
+        return nlp
+
+    def unload(self) -> None:
+        """release the models to the pool, they will be loaded again on next use"""
+        with self._load_lock:
+            pool = get_model_pool()
+            for model in self._models:
+                pool.release(model, self.excluded, self.pipes)
+            self._models.clear()
+
+    def warmup(self, model: Optional[str] = None) -> Optional[threading.Thread]:
+        """load a model in a background thread"""
+        model = model or self.model
+        if model in self._models or model in self._warming:
+            return None
+        self._warming.add(model)
+
+        def _load():
+            try:
+                self.load(model)
+            finally:
+                self._warming.discard(model)
+
+        t = threading.Thread(target=_load, daemon=True)
+        t.start()
+        return t
+
+    def _tier_ready(self, tier: str) -> bool:
+        """tiers that are not loaded yet are warmed up in the background"""
+        if tier in self._models:
+            return True
+        self.warmup(tier)
+        return False
+
+    def new_metrics(self) -> Optional[PipelineMetrics]:
+        """metrics collector for one call, None when instrumentation is disabled"""
+        return None if self.metrics_callback is None else PipelineMetrics()
+
+    def emit_metrics(self, metrics: Optional[PipelineMetrics], **extra) -> None:
+        if metrics is not None and self.metrics_callback is not None:
+            data = metrics.to_dict()
+            data.update(extra)
+            self.metrics_callback(data)
+
+    @staticmethod
+    def count_doc(doc: Doc, replacements: int, metrics: PipelineMetrics) -> None:
+        metrics.count("tokens", len(doc))
+        metrics.count("chains", len(doc.user_data.get(COREF_CHAINS_KEY, [])))
+        metrics.count("replacements", replacements)
+
+    def replace_corefs(self, text: str, join_tok=None, model: Optional[str] = None,
+                       latency_budget: Optional[float] = None) -> str:
+        model = model or self.select_model(latency_budget)
+        metrics = self.new_metrics()
+        if self.cache is not None:
+            key = self._cache_key(text, join_tok, model)
+            solved = self.cache.get(key)
+            if solved is not None:
+                if metrics is not None:
+                    metrics.count("cache_hits")
+                    self.emit_metrics(metrics, model=model)
+                return solved
+        # a lazy load, or waiting for a warmup to finish, is not latency
+        nlp = self.get_nlp(model)
+        start = time.perf_counter()
+        if metrics is None:
+            doc = nlp(text, disable=self.disabled)
+        else:
+            doc = next(self._pipe([text], model, metrics=metrics))
+        solved = self._replace_corefs_doc(doc, join_tok, metrics)
+        self._record_latency(model, time.perf_counter() - start)
+        if self.cache is not None:
+            self.cache.put(key, solved)
+        self.emit_metrics(metrics, model=model)
+        return solved
+
+    def replace_corefs_batch(self, texts: Iterable[str], join_tok=None,
+                             batch_size: int = 32, n_process: int = 1,
+                             model: Optional[str] = None,
+                             latency_budget: Optional[float] = None,
+                             metrics: Optional[PipelineMetrics] = None) -> Iterator[str]:
+        """resolve coreferences for many texts using nlp.pipe
 
+        results are streamed in the same order as the input texts,
+        cached texts are never sent to the model
+
+        metrics are reported once the batch is exhausted, unless a metrics
+        collector is passed, then the caller reports them"""
+        model = model or self.select_model(latency_budget)
+        own_metrics = metrics is None
+        if own_metrics:
+            metrics = self.new_metrics()
+
+        # (key, cached result or None) in input order, filled lazily as nlp.pipe consumes texts
+        pending = deque()
+
+        def misses():
+            for text in texts:
+                key = self._cache_key(text, join_tok, model)
+                solved = self.cache.get(key) if self.cache is not None else None
+                pending.append((key, solved))
+                if solved is None:
+                    yield text
+                elif metrics is not None:
+                    metrics.count("cache_hits")
+
+        # docs come out of nlp.pipe in bursts, so latency is averaged per batch
+        busy, count = 0.0, 0
+        self.get_nlp(model)  # load before the clock starts
+        start = time.perf_counter()
+        for doc in self._pipe(misses(), model, batch_size, n_process, metrics):
+            while pending[0][1] is not None:
+                yield pending.popleft()[1]
+            key, _ = pending.popleft()
+            solved = self._replace_corefs_doc(doc, join_tok, metrics)
+            busy += time.perf_counter() - start
+            count += 1
+            if count == batch_size:
+                self._record_latency(model, busy / count)
+                busy, count = 0.0, 0
+            if self.cache is not None:
+                self.cache.put(key, solved)
+            yield solved
+            start = time.perf_counter()
+        if count:
+            self._record_latency(model, busy / count)
+        while pending:
+            yield pending.popleft()[1]
+        if own_metrics:
+            self.emit_metrics(metrics, model=model)
+
+    def _pipe(self, texts: Iterable[str], model: str,
+              batch_size: int = 32, n_process: int = 1,
+              metrics: Optional[PipelineMetrics] = None) -> Iterator[Doc]:
+        """nlp.pipe with the profile's disabled components
+
+        with a metrics collector (and a single process) the components are
+        timed one by one, worker processes can not report their timings"""
+        if metrics is not None and n_process == 1:
+            return timed_pipe(self.get_nlp(model), texts, metrics,
+                              disable=self.disabled, batch_size=batch_size)
+        component_cfg = None
+        if n_process != 1:
+            component_cfg = {"coref_chains_export": {"strip": True}}
+        return self.get_nlp(model).pipe(texts, batch_size=batch_size,
+                                        n_process=n_process,
+                                        disable=self.disabled,
+                                        component_cfg=component_cfg)
+
+    def resolve(self, text: str, join_tok=None, model: Optional[str] = None,
+                latency_budget: Optional[float] = None) -> CorefResult:
+        """like replace_corefs, but returning the replacements made, results are not cached"""
+        return next(self.resolve_batch([text], join_tok=join_tok, model=model,
+                                       latency_budget=latency_budget))
+
+    def resolve_batch(self, texts: Iterable[str], join_tok=None,
+                      batch_size: int = 32, n_process: int = 1,
+                      model: Optional[str] = None,
+                      latency_budget: Optional[float] = None) -> Iterator[CorefResult]:
+        model = model or self.select_model(latency_budget)
+        metrics = self.new_metrics()
+        for doc in self._pipe(texts, model, batch_size, n_process, metrics):
+            if metrics is None:
+                yield self.result_from_doc(doc, join_tok, model)
+                continue
+            with metrics.timed("mapping"):
+                result = self.result_from_doc(doc, join_tok, model)
+            self.count_doc(doc, len(result), metrics)
+            yield result
+        self.emit_metrics(metrics, model=model)
+
+    def result_from_doc(self, doc: Doc, join_tok=None,
+                        model: Optional[str] = None,
+                        mapping: Optional[Dict[int, str]] = None,
+                        sources: Optional[Dict[int, int]] = None) -> CorefResult:
+        """CorefResult for an already parsed doc, optionally for a precomputed mapping"""
+        offsets: Dict[int, Tuple[int, int]] = {}
+        if mapping is None:
+            sources = {}
+            mapping = self.get_mapping(doc, join_tok, sources)
+        sources = sources or {}
+        resolved = self.render(doc, mapping, offsets=offsets)
+        replacements = []
+        for i in sorted(mapping):
+            tok = doc[i]
+            start, end = offsets[i]
+            replacements.append(Replacement(i, tok.idx, tok.idx + len(tok.text), start, end,
+                                            tok.text, resolved[start:end], sources.get(i, -1)))
+        return CorefResult(doc.text, resolved, replacements, model)
+
+    def _replace_corefs_doc(self, doc: Doc, join_tok=None,
+                            metrics: Optional[PipelineMetrics] = None) -> str:
+        if metrics is None:
+            return self.render(doc, self.get_mapping(doc, join_tok))
+        with metrics.timed("mapping"):
+            mapping = self.get_mapping(doc, join_tok)
+        with metrics.timed("render"):
+            text = self.render(doc, mapping)
+        self.count_doc(doc, len(mapping), metrics)
+        return text
+
+    def render(self, doc: Doc, mapping: Dict[int, str],
+               start: int = 0, end: Optional[int] = None,
+               offsets: Optional[Dict[int, Tuple[int, int]]] = None) -> str:
+        """rebuild the text of doc[start:end] with the replacements from mapping
+
+        with preserve_whitespace the original spacing is kept, otherwise tokens are
+        space separated except before "," and "." (legacy output format)
+
+        if an offsets dict is given it is filled with the (start, end) character
+        span of every replaced token in the returned text"""
+        end = len(doc) if end is None else end
+        out = []
+        pos = 0
+        comma_glued = False  # the space after a glued comma can not glue the next one
+        for i in range(start, end):
+            piece = mapping.get(i)
+            replaced = piece is not None
+            if not replaced:
+                piece = doc[i].text
+            elif not self.preserve_whitespace:
+                piece = piece.replace(" .", ".")
+            if i > start and not self.preserve_whitespace:
+                if piece == "," and i < end - 1 and not comma_glued:
+                    comma_glued = True
+                elif piece.startswith("."):
+                    comma_glued = False
+                else:
+                    comma_glued = False
+                    out.append(" ")
+                    pos += 1
+            if replaced and offsets is not None:
+                offsets[i] = (pos, pos + len(piece))
+            out.append(piece)
+            pos += len(piece)
+            if self.preserve_whitespace:
+                out.append(doc[i].whitespace_)
+                pos += len(doc[i].whitespace_)
+        text = "".join(out)
+        return text.rstrip() if self.preserve_whitespace else text
+
+    def get_mapping(self, doc: Doc, join_tok=None,
+                    sources: Optional[Dict[int, int]] = None) -> Dict[int, str]:
+        """token index -> replacement string for an already parsed doc
+
+        single pass over the tokens for the pronoun heuristics, keeping a running
+        list of the nouns seen so far for "we", followed by one pass over a
+        precomputed chain -> representative table
+
+        if a sources dict is given it is filled with the coref chain index behind
+        every replacement, -1 for replacements made by the pronoun heuristics"""
         mapping: Dict[int, str] = {}
+        nouns: List[str] = []  # NOUN/PROPN/PRON seen so far, already resolved
         prev_propn = None
+        n_toks = len(doc)
         for idx, tok in enumerate(doc):
-            next_token = doc[idx + 1] if idx < len(doc) - 1 else None
-            if tok.pos_ == "PROPN":
+            pos = tok.pos_
+            if pos == "PROPN":
                 prev_propn = tok
-            elif tok.pos_ == "PRON":
-                if tok.text.lower() in ["me"]:
-                    #print(" -", idx, tok, "->", self.first_person)
+            elif pos == "PRON":
+                lower = tok.lower_
+                if lower == "me":
                     mapping[idx] = self.first_person
-                elif tok.text.lower() in ["i"]:
-                    #print(" -", idx, tok, "->", self.first_person)
+                elif lower == "i":
                     mapping[idx] = self.first_person
-                    if next_token.text == "have":
-                        mapping[idx + 1] = "has"
-                    elif next_token.pos_ == "VERB" and next_token.text.endswith("e"):
-                        mapping[idx + 1] = next_token.text + "s"
-                elif tok.text.lower() in ["my", "mine"]:
-                    #print(" -", idx, tok, "->", self.first_person + "'s")
+                    if idx + 1 < n_toks:
+                        next_token = doc[idx + 1]
+                        if next_token.text == "have":
+                            mapping[idx + 1] = "has"
+                        elif next_token.pos_ == "VERB" and next_token.text.endswith("e"):
+                            mapping[idx + 1] = next_token.text + "s"
+                elif lower in ("my", "mine"):
                     mapping[idx] = self.first_person + "'s"
-                elif tok.text.lower() in ["mine"]:
-                    #print(" -", idx, tok, "->", "belongs to " + self.first_person)
-                    mapping[idx] = self.first_person
-                    mapping[idx - 1] = "belongs to"
-                elif tok.text.lower() in ["who"] and prev_propn:
-                    #print(" -", idx, tok, "->", prev_propn)
+                elif lower == "who" and prev_propn:
                     mapping[idx] = prev_propn.text
-                elif tok.text.lower() in ["we"]:
-                    nouns = [mapping.get(i) or tok.text
-                             for i, tok in enumerate(doc[:idx])
-                             if tok.pos_ in ['NOUN', 'PROPN', 'PRON']]
-
+                elif lower == "we":
                     if len(nouns) == 2 or join_tok is not None:
-                        plural = " and ".join(nouns)
-                        #print(" -", idx, tok, "->", plural)
-                        mapping[idx] = plural
+                        mapping[idx] = " and ".join(nouns)
                     elif len(nouns) > 2:
-                        last = nouns[-1]
-                        nouns = nouns[:-1]
-                        plural = ", ".join(nouns) + " and " + last
-                        #print(" -", idx, tok, "->", plural)
-                        mapping[idx] = plural
-
-        for chain in doc._.coref_chains:
-            plural = any(len(mention) > 1 for mention in chain.mentions)
-            if plural:
-                continue
+                        mapping[idx] = ", ".join(nouns[:-1]) + " and " + nouns[-1]
+            if pos in ("NOUN", "PROPN", "PRON"):
+                nouns.append(mapping.get(idx) or tok.text)
 
-            ctoks = []
-            for m in chain.mentions:
-                # filter pronouns from candidate replacements
-                ctoks += [doc[i] for i in m.token_indexes if doc[i].pos_ in ['NOUN', 'PROPN']]
-            if not ctoks:
-                continue
+        if sources is not None:
+            sources.update(dict.fromkeys(mapping, -1))
+        for chain_idx, mentions, resolved in self._chain_table(doc):
+            if not isinstance(resolved, str):
+                # plural chain, single token mentions -> joint longest mention
+                resolved = " and ".join([mapping.get(i) or doc[i].text for i in resolved])
+            # singular chain, every mention head -> representative token
+            for idx in mentions:
+                mapping[idx] = resolved
+                if sources is not None:
+                    sources[idx] = chain_idx
+        return mapping
 
-            # pick the longest PROPER NOUN token
-            propers = [tok for tok in ctoks if tok.pos_ == 'PROPN']
-            if propers:
-                resolve_tok = max(propers, key=lambda k: len(k.text))
-            else:
-                # let's just pick the longest NOUN token
-                resolve_tok = max(ctoks, key=lambda k: len(k.text))
-
-            for mention in chain.mentions:
-                idx = mention[0]
-                if resolve_tok.text == doc[idx].text:
-                    continue
-                #print(" -", idx, doc[idx], "->", resolve_tok)
-                mapping[idx] = resolve_tok.text
-
-        for chain in doc._.coref_chains:
-            plural = any(len(mention) > 1 for mention in chain.mentions)
-            if plural:
-                m = max(chain.mentions, key=len)
-                joint_str = " and ".join([mapping.get(i) or doc[i].text for i in m])
-                for mention in chain:
-                    if len(mention) == 1:
-                        idx = mention[0]
-                        mapping[idx] = joint_str
-                        #print(" -", idx, doc[idx], "->", joint_str)
-
-        tokens = [mapping.get(idx, t.text)
-                  for idx, t in enumerate(doc)]
-        return " ".join(tokens).replace(" , ", ", ").replace(" .", ".")
+    @staticmethod
+    def _chain_table(doc: Doc) -> List[tuple]:
+        """one walk over the coref chains
 
+        returns (chain index, mention indexes to replace, representative) for every
+        chain that resolves to something. All singular chains come first, the representative
+        is the longest PROPN (or NOUN) text. Plural chains, those with a multi token
+        mention, follow with the longest mention as the representative"""
+        singular, plural = [], []
+        for chain_idx, chain in enumerate(doc.user_data[COREF_CHAINS_KEY]):
+            if any(len(mention) > 1 for mention in chain):
+                singles = [mention[0] for mention in chain if len(mention) == 1]
+                plural.append((chain_idx, singles, max(chain, key=len)))
+                continue
+            best_propn, best_noun = None, None
+            for m in chain:
+                for i in m:
+                    tok = doc[i]
+                    # filter pronouns from candidate replacements
+                    if tok.pos_ == "PROPN":
+                        if best_propn is None or len(tok.text) > len(best_propn):
+                            best_propn = tok.text
+                    elif tok.pos_ == "NOUN":
+                        if best_noun is None or len(tok.text) > len(best_noun):
+                            best_noun = tok.text
+            if best_propn is None and best_noun is None:
+                continue
+            if best_propn is not None:
+                resolved = best_propn
+            else:
+                resolved = best_noun
+            singular.append((chain_idx, [m[0] for m in chain if doc[m[0]].text != resolved], resolved))
+        return singular + plural
 
 if __name__ == "__main__":
+    from ovos_coreferee.corpus import COREF_SENTENCES
+
     coref = CorefereeParser(first_person_token="Miro")
 
-    test = [
-        "My name is Miro. I like beer",
-        "Barrack Obama was born in Hawaii. He was president of the United States and lived in the White House.",
-        "London has been a major settlement for two millennia. It was founded by the Romans, who named it Londinium.",
-        "He was very busy with his work, Peter had had enough of it. He and his wife decided they needed a holiday. They travelled to Spain because they loved the country very much.",
-        "My name is Miro. I like beer",
-        "The ring belongs to me!",
-        "The ring is mine! My birthday gift, my precious",
-        "I love my baby",
-        "I have a dog, a cat and a bird. we are a happy family",
-        "My neighbors have a cat. It has a bushy tail",
-        "My sister has a dog, She loves him!",
-        "Here is the book now take it",
-        "The sign was too far away for the boy to read it",
-        "Dog is man's best friend. It is always loyal",
-        "The girl said she would take the trash out",
-        "I voted for Bob because he is clear about his values. His ideas represent a majority of the nation. He is better than Alice",
-        "Jack von Doom is one of the top candidates in the elections. His ideas are unique compared to Bob's",
-        "Members voted for John because they see him as a good leader",
-        "Leaders around the world say they stand for peace",
-        "My neighbours just adopted a puppy. They care for it like a baby",
-        "I have many friends. They are an important part of my life",
-        "is the light turned on? turn it off",
-        "Turn off the light and change it to blue",
-        "call Mom. tell her to buy eggs. tell her to buy coffee. tell her to buy milk",
-        "call dad. tell him to buy bacon. tell him to buy coffee. tell him to buy beer",
-        "Chris is very handsome. He is Australian. Elsa lives in Arendelle. He likes her.",
-        "One night, Michael caught Tom in his office",
-        "One night, Michael caught Tom breaking into his office",
-        "Alice invited Marcia to go with her",
-        "The Martians invited the Venusians to go with them to Pluto",
-        "A short while later, Michael decided that he wanted to play a role in his son's life, and tried to get Lisa to marry him, but by this time, she wanted nothing to do with him. Around the same time, Lisa's son Tom had returned from Vietnam with a drug habit. One night, Michael caught Tom breaking into his office to steal drugs",
-        "Kevin invited Bob to go with him to his favorite fishing spot",
-        "Bob telephoned Jake to tell him that he lost the laptop.",
-        "Ana telephoned Alice to tell her that she lost the bus",
-        "The Martians told the Venusians that they used to have an ocean",
-        "Joe was talking to Bob and told him to go home because he was drunk",
-        "the dudes were talking with their enemies and they decided to avoid war",
-        "Janet has a husband, Sproule, and one son, Sam. A second child was stillborn in November 2009, causing her to miss Bristol City's match against Nottingham Forest. City manager Gary Johnson dedicated their equalising goal in the match to Janet, who had sent a message of support to her teammates.",
-        "Sproule has a wife, Janet, and one son, Sam. A second child was stillborn in November 2009, causing him to miss Bristol City's match against Nottingham Forest. City manager Gary Johnson dedicated their equalising goal in the match to Sproule, who had sent a message of support to his teammates.",
-        "Bob threatened to kill Alice to make her pay her debts",
-        "Alice invited Marcia to go with her to their favorite store",
-        "Adriana said she loves me!"
-
-    ]
+    test = COREF_SENTENCES
     for t in test:
         print(t)
         print("     ", coref.replace_corefs(t))
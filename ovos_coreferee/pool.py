@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import spacy
+from spacy.cli import download
+from spacy.language import Language
+
+
+def rss_bytes() -> int:
+    """current resident set size of this process, 0 if unknown"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def ensure_model(model: str, offline: bool = False,
+                 timings: Optional[Dict[str, float]] = None) -> None:
+    """make sure a spacy model package is installed, downloading it unless offline
+
+    time spent per stage is added to the optional timings dict"""
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    installed = spacy.util.is_package(model)
+    timings["is_package"] = timings.get("is_package", 0.0) + time.perf_counter() - start
+    if installed:
+        return
+    if offline:
+        raise RuntimeError(f"spacy model '{model}' is not installed "
+                           f"and offline mode forbids downloading it")
+    start = time.perf_counter()
+    download(model)
+    timings["download"] = timings.get("download", 0.0) + time.perf_counter() - start
+
+
+def load_model(model: str, offline: bool = False,
+               timings: Optional[Dict[str, float]] = None,
+               exclude: Sequence[str] = ()) -> Language:
+    """ensure_model + spacy.load, recording time per stage in timings"""
+    timings = timings if timings is not None else {}
+    ensure_model(model, offline, timings)
+    start = time.perf_counter()
+    nlp = spacy.load(model, exclude=list(exclude))
+    timings["load"] = time.perf_counter() - start
+    return nlp
+
+
+class ModelPool:
+    """process wide, reference counted spaCy pipelines
+
+    pipelines are keyed by model name, excluded components and the extra pipes
+    added after loading, so every plugin asking for the same configuration
+    shares a single copy of the model. A pipeline is dropped when its last
+    user releases it
+
+    extra pipes are factory names or (name, ((config key, value), ...)) tuples"""
+
+    def __init__(self) -> None:
+        self._models: Dict[tuple, Language] = {}
+        self._refs: Dict[tuple, int] = {}
+        # RSS growth and seconds per loading stage, per key
+        self.memory: Dict[tuple, int] = {}
+        self.load_timings: Dict[tuple, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+
+    @staticmethod
+    def make_key(model: str, exclude: Sequence[str] = (),
+                 pipes: Sequence[str] = ()) -> Tuple[str, tuple, tuple]:
+        return model, tuple(sorted(exclude)), tuple(pipes)
+
+    def acquire(self, model: str, exclude: Sequence[str] = (), pipes: Sequence[str] = (),
+                offline: bool = False) -> Language:
+        """shared pipeline for this configuration, loaded on first request
+
+        every acquire must be paired with a release"""
+        key = self.make_key(model, exclude, pipes)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+            # counted before loading, so the key lock outlives every waiting caller
+            self._refs[key] = self._refs.get(key, 0) + 1
+        try:
+            return self._load(key, key_lock, model, exclude, pipes, offline)
+        except BaseException:
+            self.release(model, exclude, pipes)
+            raise
+
+    def acquire_loaded(self, model: str, exclude: Sequence[str] = (),
+                       pipes: Sequence[str] = ()) -> Optional[Language]:
+        """shared pipeline for this configuration if it is already loaded, never loads
+
+        a returned pipeline must be released like one from acquire"""
+        key = self.make_key(model, exclude, pipes)
+        with self._lock:
+            nlp = self._models.get(key)
+            if nlp is not None:
+                self._refs[key] = self._refs.get(key, 0) + 1
+            return nlp
+
+    def _load(self, key: tuple, key_lock: threading.Lock, model: str,
+              exclude: Sequence[str], pipes: Sequence[str], offline: bool) -> Language:
+        # loading happens outside the pool lock so other models can load concurrently
+        with key_lock:
+            if key not in self._models:
+                timings = {}
+                rss = rss_bytes()
+                start = time.perf_counter()
+                nlp = load_model(model, offline, timings, exclude=exclude)
+                t = time.perf_counter()
+                for pipe in pipes:
+                    if isinstance(pipe, str):
+                        nlp.add_pipe(pipe)
+                    else:  # (factory name, ((config key, value), ...))
+                        nlp.add_pipe(pipe[0], config=dict(pipe[1]))
+                timings["add_pipe"] = time.perf_counter() - t
+                timings["total"] = time.perf_counter() - start
+                with self._lock:
+                    self._models[key] = nlp
+                    self.memory[key] = max(rss_bytes() - rss, 0)
+                    self.load_timings[key] = timings
+            return self._models[key]
+
+    def release(self, model: str, exclude: Sequence[str] = (), pipes: Sequence[str] = ()) -> None:
+        key = self.make_key(model, exclude, pipes)
+        with self._lock:
+            if key not in self._refs:
+                return
+            self._refs[key] -= 1
+            if self._refs[key] <= 0:
+                self._refs.pop(key)
+                self._models.pop(key, None)
+                self.memory.pop(key, None)
+                self.load_timings.pop(key, None)
+                self._key_locks.pop(key, None)
+
+    @property
+    def memory_bytes(self) -> int:
+        """RSS growth caused by loading every pooled model, 0 if unknown"""
+        return sum(self.memory.values())
+
+    @property
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {"|".join([key[0], ",".join(key[1]),
+                              ",".join(p if isinstance(p, str) else p[0] for p in key[2])]): {
+                "refs": self._refs.get(key, 0),
+                "memory_mb": round(self.memory.get(key, 0) / 1024 / 1024, 1),
+                "load_timings": self.load_timings.get(key, {})}
+                for key in self._models}
+
+
+_MODEL_POOL: Optional[ModelPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_model_pool() -> ModelPool:
+    """process wide model pool shared by every plugin"""
+    global _MODEL_POOL
+    with _POOL_LOCK:
+        if _MODEL_POOL is None:
+            _MODEL_POOL = ModelPool()
+    return _MODEL_POOL
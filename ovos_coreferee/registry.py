@@ -0,0 +1,103 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Union
+
+from ovos_coreferee.parser import CorefereeParser
+from ovos_coreferee.workers import CorefWorkerPool
+
+# languages supported by coreferee
+DEFAULT_MODELS = {
+    "en": "en_core_web_trf",
+    "de": "de_core_news_lg",
+    "fr": "fr_core_news_lg",
+    "pl": "pl_core_news_lg"
+}
+
+
+class ParserRegistry:
+    """one lazily loaded CorefereeParser per language
+
+    when a memory budget is set, the least recently used languages are unloaded
+    after a new model is loaded until the resident models fit in the budget,
+    languages held with use() are never unloaded
+
+    with workers > 0 each language is served by a CorefWorkerPool instead"""
+
+    def __init__(self, models: Optional[Dict[str, str]] = None,
+                 memory_budget_mb: Optional[float] = None,
+                 workers: int = 0,
+                 **parser_kwargs) -> None:
+        self.models = dict(DEFAULT_MODELS)
+        self.models.update(models or {})
+        self.memory_budget_mb = memory_budget_mb
+        self.workers = workers
+        self.parser_kwargs = parser_kwargs
+        self.parsers: Dict[str, Union[CorefereeParser, CorefWorkerPool]] = {}
+        self.last_used: Dict[str, float] = {}
+        # callers currently holding each language through use()
+        self.in_use: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_lang(lang: str) -> str:
+        return lang.lower().split("-")[0].split("_")[0]
+
+    def is_supported(self, lang: str) -> bool:
+        return self.normalize_lang(lang) in self.models
+
+    def get(self, lang: str) -> Union[CorefereeParser, CorefWorkerPool]:
+        """parser for lang, the model is loaded on first use
+
+        loading other languages may unload it again, hold it with use() instead"""
+        with self.use(lang) as parser:
+            return parser
+
+    @contextmanager
+    def use(self, lang: str) -> Iterator[Union[CorefereeParser, CorefWorkerPool]]:
+        """parser for lang, kept loaded until the block exits"""
+        lang = self.normalize_lang(lang)
+        if lang not in self.models:
+            raise ValueError(f"unsupported language: {lang}")
+        with self._lock:
+            if lang not in self.parsers:
+                if self.workers:
+                    self.parsers[lang] = CorefWorkerPool(workers=self.workers,
+                                                         model=self.models[lang],
+                                                         **self.parser_kwargs)
+                else:
+                    self.parsers[lang] = CorefereeParser(model=self.models[lang],
+                                                         **self.parser_kwargs)
+            self.last_used[lang] = time.monotonic()
+            self.in_use[lang] = self.in_use.get(lang, 0) + 1
+            parser = self.parsers[lang]
+        try:
+            if not parser.loaded:
+                parser.load()
+                self.enforce_budget(keep=lang)
+            yield parser
+        finally:
+            with self._lock:
+                self.in_use[lang] -= 1
+
+    @property
+    def memory_usage_mb(self) -> float:
+        return sum(p.memory_bytes for p in self.parsers.values()) / 1024 / 1024
+
+    def enforce_budget(self, keep: Optional[str] = None) -> None:
+        """unload idle languages until the loaded models fit in the memory budget"""
+        if not self.memory_budget_mb:
+            return
+        with self._lock:
+            idle = sorted((l for l, p in self.parsers.items()
+                           if p.loaded and l != keep and not self.in_use.get(l)),
+                          key=lambda l: self.last_used.get(l, 0))
+            for lang in idle:
+                if self.memory_usage_mb <= self.memory_budget_mb:
+                    break
+                self.parsers[lang].unload()
+
+    def unload(self, lang: str) -> None:
+        parser = self.parsers.get(self.normalize_lang(lang))
+        if parser is not None:
+            parser.unload()
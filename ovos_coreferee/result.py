@@ -0,0 +1,84 @@
+from typing import Dict, Iterator, List, Optional
+
+
+class Replacement:
+    """a single token replaced by the coreference resolution
+
+    start/end are character offsets of the token in the original text,
+    resolved_start/resolved_end the offsets of its replacement in the resolved text.
+    chain is the coreferee chain index, -1 for the pronoun heuristics"""
+    __slots__ = ("token", "start", "end", "resolved_start", "resolved_end",
+                 "text", "replacement", "chain")
+
+    def __init__(self, token: int, start: int, end: int,
+                 resolved_start: int, resolved_end: int,
+                 text: str, replacement: str, chain: int = -1) -> None:
+        self.token = token
+        self.start = start
+        self.end = end
+        self.resolved_start = resolved_start
+        self.resolved_end = resolved_end
+        self.text = text
+        self.replacement = replacement
+        self.chain = chain
+
+    def to_list(self) -> list:
+        return [getattr(self, k) for k in self.__slots__]
+
+    @classmethod
+    def from_list(cls, data: list) -> "Replacement":
+        return cls(*data)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Replacement) and self.to_list() == other.to_list()
+
+    def __repr__(self) -> str:
+        return f"Replacement({self.token}, {self.text!r} -> {self.replacement!r}, chain={self.chain})"
+
+
+class CorefResult:
+    """original text, resolved text and the replacements that turned one into the other"""
+    __slots__ = ("text", "resolved", "replacements", "model")
+
+    def __init__(self, text: str, resolved: str,
+                 replacements: Optional[List[Replacement]] = None,
+                 model: Optional[str] = None) -> None:
+        self.text = text
+        self.resolved = resolved
+        self.replacements = replacements or []
+        self.model = model
+
+    def __iter__(self) -> Iterator[Replacement]:
+        return iter(self.replacements)
+
+    def __len__(self) -> int:
+        return len(self.replacements)
+
+    def __str__(self) -> str:
+        return self.resolved
+
+    def __repr__(self) -> str:
+        return f"CorefResult({self.text!r} -> {self.resolved!r}, {len(self.replacements)} replacements)"
+
+    @property
+    def chains(self) -> Dict[int, List[Replacement]]:
+        """replacements grouped by coref chain index"""
+        chains = {}
+        for r in self.replacements:
+            if r.chain >= 0:
+                chains.setdefault(r.chain, []).append(r)
+        return chains
+
+    def to_dict(self) -> dict:
+        """compact, json serializable representation, replacements are flat lists
+        in Replacement.__slots__ order"""
+        return {"text": self.text,
+                "resolved": self.resolved,
+                "model": self.model,
+                "replacements": [r.to_list() for r in self.replacements]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CorefResult":
+        return cls(data["text"], data["resolved"],
+                   [Replacement.from_list(r) for r in data.get("replacements", [])],
+                   data.get("model"))
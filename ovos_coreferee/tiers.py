@@ -0,0 +1,56 @@
+from typing import Dict, List, Optional
+
+
+class TierSelectionMixin:
+    """model tier selection from recent latency, shared by every resolver backend
+
+    tiers go from most to least accurate, faster tiers are used when the recent
+    latency of the better ones exceeds the latency budget (seconds). Results are
+    cached per tier and pipeline, see _cache_key
+
+    classes using it call _init_tiers and set first_person, preserve_whitespace,
+    disabled and pipes"""
+
+    def _init_tiers(self, model: str, fallback_models: Optional[List[str]] = None,
+                    latency_budget: Optional[float] = None, probe_interval: int = 50) -> None:
+        self.model = model
+        self.tiers = [model] + [m for m in fallback_models or [] if m != model]
+        self.latency_budget = latency_budget
+        self.probe_interval = probe_interval
+        # exponential moving average of seconds per utterance, per tier
+        self.latency: Dict[str, float] = {}
+        self._selections = 0
+
+    def _tier_ready(self, tier: str) -> bool:
+        """whether a fallback tier can serve requests right now"""
+        return True
+
+    def select_model(self, latency_budget: Optional[float] = None) -> str:
+        """pick the most accurate tier whose recent latency fits the budget
+
+        tiers that are not ready are skipped together with all the faster ones,
+        the best ready tier is used in the meantime"""
+        budget = latency_budget or self.latency_budget
+        if budget is None or len(self.tiers) == 1:
+            return self.model
+        self._selections += 1
+        if self.probe_interval and self._selections % self.probe_interval == 0:
+            # periodically retry the best tier so we can recover after a slow spell
+            return self.model
+        chosen = self.model
+        for tier in self.tiers:
+            if tier != self.model and not self._tier_ready(tier):
+                break
+            chosen = tier
+            if self.latency.get(tier, 0) <= budget:
+                break
+        return chosen
+
+    def _record_latency(self, model: str, seconds: float, alpha: float = 0.2) -> None:
+        prev = self.latency.get(model)
+        self.latency[model] = seconds if prev is None else prev + alpha * (seconds - prev)
+
+    def _cache_key(self, text: str, join_tok=None, model: Optional[str] = None) -> tuple:
+        # the profile changes the annotations coreferee sees, so it changes the output
+        return (model or self.model, tuple(self.disabled), tuple(self.pipes),
+                self.first_person, join_tok, self.preserve_whitespace, text)
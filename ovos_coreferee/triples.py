@@ -1,10 +1,22 @@
-from typing import Tuple, Dict, List, Iterable
-
-import spacy
-from spacy.cli import download
-from spacy.tokens import Token
-
-from ovos_coreferee.parser import CorefereeParser
+import importlib.util
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from typing import Tuple, Dict, List, Iterable, Iterator, Optional, AsyncIterator, Callable, Union
+
+from spacy.language import Language
+from spacy.tokens import Doc, Token
+
+from ovos_coreferee.aio import iterate_in_thread
+from ovos_coreferee.doccache import DocCache
+from ovos_coreferee.linker import LINKER_PIPE
+from ovos_coreferee.metrics import MetricsCallback, PipelineMetrics, timed_pipe
+from ovos_coreferee.parser import COREF_PIPES, CorefereeParser, PIPELINE_PROFILES
+from ovos_coreferee.pool import get_model_pool
+from ovos_coreferee.window import WindowedCorefResolver
 try:
     from ovos_plugin_manager.templates.triples import TriplesExtractor
 except ImportError:  # needs https://github.com/OpenVoiceOS/ovos-plugin-manager/pull/257
@@ -18,13 +30,28 @@ except ImportError:  # needs https://github.com/OpenVoiceOS/ovos-plugin-manager/
             """Extract semantic triples from a list of documents."""
 
 
+def iter_lines(path: Union[str, os.PathLike]) -> Iterator[str]:
+    """lines of a text file without the trailing newline, read lazily"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
 class DependencyParser:
     def __init__(self):
         self.NEGATION = {"no", "not", "n't", "never", "none"}
         self.SUBJECTS = {"nsubj", "nsubjpass", "csubj", "csubjpass", "agent", "expl"}
         self.OBJECTS = {"dobj", "dative", "attr", "oprd", "pobj"}
 
-    def extract_NER_preps(self, doc):
+    def resolve(self, tok, mapping: Optional[Dict[int, str]] = None) -> List[str]:
+        """token text, or the coreference resolution(s) for it if a mapping is given
+
+        plural resolutions ("Peter and wife") are split so each entity gets its own triple"""
+        if not mapping or not isinstance(tok, Token) or tok.i not in mapping:
+            return [tok.text]
+        return [t for t in re.split(r", | and ", mapping[tok.i]) if t]
+
+    def extract_NER_preps(self, doc, mapping: Optional[Dict[int, str]] = None):
         triples = []
         # TODO - "Barrack Obama was born in Hawaii. Obama was president of the United States and lived in the White House.",
         # missing (Obama, lived in, the White House)
@@ -39,7 +66,8 @@ class DependencyParser:
             preps = [prep for prep in ent.root.head.children if prep.dep_ == "prep"]
             for prep in preps:
                 for child in prep.children:
-                    triples.append((ent_text, "{} {}".format(ent.root.head, prep), child.text))
+                    for obj in self.resolve(child, mapping):
+                        triples.append((ent_text, "{} {}".format(ent.root.head, prep), obj))
         return triples
 
     def get_subs_from_conjunctions(self, subs: List[Token]) -> List[Token]:
@@ -62,7 +90,8 @@ class DependencyParser:
     def is_negated(self, tok: Token) -> bool:
         return any(dep.lower_ in self.NEGATION for dep in tok.children)
 
-    def find_svos(self, tokens: List[Token]) -> List[Tuple[str, str, str]]:
+    def find_svos(self, tokens: List[Token],
+                  mapping: Optional[Dict[int, str]] = None) -> List[Tuple[str, str, str]]:
         svos = []
 
         verbs = [(idx, tok) for idx, tok in enumerate(tokens) if tok.pos_ in ["VERB", "AUX"]]
@@ -74,7 +103,7 @@ class DependencyParser:
 
             # Handle copular constructions
             if v.lemma_ in {"be"}:
-                cop_svos = self.handle_copular_constructions(v, subs)
+                cop_svos = self.handle_copular_constructions(v, subs, mapping)
                 if cop_svos:
                     svos.extend(cop_svos)
                 continue
@@ -85,13 +114,12 @@ class DependencyParser:
                 objs.extend(self.get_objs_from_conjunctions(objs))
                 for obj in objs:
                     obj_negated = self.is_negated(obj)
-                    svos.append((
-                        sub.text,
-                        "!" if verb_negated or obj_negated else "" + (
-                            v.lemma_ + " " + nxt.text
-                            if nxt is not None and nxt.dep_ == "prep" else v.lemma_),
-                        obj.text
-                    ))
+                    rel = "!" if verb_negated or obj_negated else "" + (
+                        v.lemma_ + " " + nxt.text
+                        if nxt is not None and nxt.dep_ == "prep" else v.lemma_)
+                    for s in self.resolve(sub, mapping):
+                        for o in self.resolve(obj, mapping):
+                            svos.append((s, rel, o))
 
             if not subs:
                 subject = None
@@ -112,11 +140,10 @@ class DependencyParser:
                                     obj = tokens[idx + idx2 - 1: idx + idx2 + 1]
                                 else:
                                     obj = tok
-                                svos.append((
-                                    subject.text,
-                                    v.lemma_ + " " + nxt.text if nxt.dep_ == "prep" else v.lemma_,
-                                    obj.text
-                                ))
+                                rel = v.lemma_ + " " + nxt.text if nxt.dep_ == "prep" else v.lemma_
+                                for s in self.resolve(subject, mapping):
+                                    for o in self.resolve(obj, mapping):
+                                        svos.append((s, rel, o))
                                 objs.append(obj)
                                 break
 
@@ -136,12 +163,167 @@ class DependencyParser:
         objs.extend(self.get_objs_from_conjunctions(objs))
         return v, objs
 
-    def handle_copular_constructions(self, v: Token, subs: List[Token]) -> List[Tuple[str, str, str]]:
+    def handle_copular_constructions(self, v: Token, subs: List[Token],
+                                     mapping: Optional[Dict[int, str]] = None) -> List[Tuple[str, str, str]]:
         svos = []
         for sub in subs:
             objs = [tok for tok in v.rights if tok.dep_ in {"attr", "acomp", "pobj"}]
             for obj in objs:
-                svos.append((sub.text, v.lemma_, obj.text))
+                for s in self.resolve(sub, mapping):
+                    for o in self.resolve(obj, mapping):
+                        svos.append((s, v.lemma_, o))
+        return svos
+
+
+class DependencyIndex:
+    """dependency tables of a parsed doc, built in a single pass over its tokens
+
+    children are grouped by the index of their head, so the subjects, objects and
+    conjunctions of a verb are looked up instead of re-scanning the tokens"""
+
+    def __init__(self, doc, parser: DependencyParser) -> None:
+        self.subjects: Dict[int, List[Token]] = {}  # subjects left of their head
+        self.objects: Dict[int, List[Token]] = {}  # objects right of their head
+        self.copular: Dict[int, List[Token]] = {}  # attr/acomp/pobj right of their head
+        self.subj_conj: Dict[int, List[Token]] = {}  # subject conjunction candidates
+        self.obj_conj: Dict[int, List[Token]] = {}  # object conjunction candidates
+        self.has_and = set()  # tokens with "and" on their right
+        self.negated = set()  # tokens with a negation child
+        self._subs: Dict[int, List[Token]] = {}
+        self._objs: Dict[tuple, List[Token]] = {}
+        self.parser = parser
+        for tok in doc:
+            head = tok.head.i
+            if head == tok.i:
+                continue
+            if tok.lower_ in parser.NEGATION:
+                self.negated.add(head)
+            if tok.i < head:
+                if tok.dep_ in parser.SUBJECTS:
+                    self.subjects.setdefault(head, []).append(tok)
+                continue
+            if tok.lower_ == "and":
+                self.has_and.add(head)
+            if tok.dep_ in parser.OBJECTS:
+                self.objects.setdefault(head, []).append(tok)
+            if tok.dep_ in {"attr", "acomp", "pobj"}:
+                self.copular.setdefault(head, []).append(tok)
+            if tok.dep_ in parser.SUBJECTS or tok.pos_ == "NOUN":
+                self.subj_conj.setdefault(head, []).append(tok)
+            if tok.dep_ in parser.OBJECTS or tok.pos_ == "NOUN":
+                self.obj_conj.setdefault(head, []).append(tok)
+
+    def subs_from_conjunctions(self, tok: Token) -> List[Token]:
+        """DependencyParser.get_subs_from_conjunctions([tok]), memoized"""
+        if tok.i not in self._subs:
+            more_subs = []
+            if tok.i in self.has_and:
+                conj = self.subj_conj.get(tok.i, [])
+                more_subs.extend(conj)
+                for sub in conj:
+                    more_subs.extend(self.subs_from_conjunctions(sub))
+            self._subs[tok.i] = more_subs
+        return self._subs[tok.i]
+
+    def objs_from_conjunctions(self, objs: List[Token]) -> List[Token]:
+        """DependencyParser.get_objs_from_conjunctions(objs), memoized
+
+        the original recurses over the list it is growing, so the result is kept
+        as is (duplicates included) to emit the same triples"""
+        key = tuple(tok.i for tok in objs)
+        if key not in self._objs:
+            more_objs = []
+            for obj in objs:
+                if obj.i in self.has_and:
+                    more_objs.extend(self.obj_conj.get(obj.i, []))
+                    more_objs.extend(self.objs_from_conjunctions(more_objs))
+            self._objs[key] = more_objs
+        return self._objs[key]
+
+    def get_all_subs(self, v: Token) -> List[Token]:
+        subs = list(self.subjects.get(v.i, []))
+        for sub in self.subjects.get(v.i, []):
+            subs.extend(self.subs_from_conjunctions(sub))
+        return subs
+
+    def get_all_objs(self, v: Token) -> List[Token]:
+        objs = self.objects.get(v.i, [])
+        return objs + self.objs_from_conjunctions(objs)
+
+
+class IndexedDependencyParser(DependencyParser):
+    """DependencyParser with find_svos over a DependencyIndex
+
+    emits exactly the same triples, but the dependency tables are built once per doc
+    and the nearest subject / object of every verb comes from prefix tables, so the
+    cost is linear in the number of tokens instead of quadratic"""
+
+    def find_svos(self, tokens: List[Token],
+                  mapping: Optional[Dict[int, str]] = None) -> List[Tuple[str, str, str]]:
+        svos = []
+        if not len(tokens):
+            return svos
+        index = DependencyIndex(tokens[0].doc, self)
+
+        # position -> last subject at or before it
+        last_subject = []
+        subject = None
+        for tok in tokens:
+            if tok.dep_ in self.SUBJECTS:
+                subject = tok
+            last_subject.append(subject)
+        # position -> position of the first object at or after it
+        next_object = [None] * len(tokens)
+        pos = None
+        for idx in range(len(tokens) - 1, -1, -1):
+            if tokens[idx].dep_ in self.OBJECTS:
+                pos = idx
+            next_object[idx] = pos
+
+        for idx, v in enumerate(tokens):
+            if v.pos_ not in ("VERB", "AUX"):
+                continue
+            nxt = tokens[idx + 1] if idx + 1 < len(tokens) else None
+            subs = index.get_all_subs(v)
+
+            # Handle copular constructions
+            if v.lemma_ in {"be"}:
+                for sub in subs:
+                    for obj in index.copular.get(v.i, []):
+                        for s in self.resolve(sub, mapping):
+                            for o in self.resolve(obj, mapping):
+                                svos.append((s, v.lemma_, o))
+                continue
+
+            objs = index.get_all_objs(v)
+            verb_negated = v.i in index.negated
+            # General cases
+            for sub in subs:
+                for obj in objs:
+                    rel = "!" if verb_negated or obj.i in index.negated else "" + (
+                        v.lemma_ + " " + nxt.text
+                        if nxt is not None and nxt.dep_ == "prep" else v.lemma_)
+                    for s in self.resolve(sub, mapping):
+                        for o in self.resolve(obj, mapping):
+                            svos.append((s, rel, o))
+
+            if not subs:
+                subject = last_subject[idx]
+                if not subject or objs or nxt is None or nxt.dep_ in ["ROOT"]:
+                    continue
+                pos = next_object[idx]
+                if pos is None:
+                    continue
+                prev = tokens[pos - 1] if pos > idx else None
+                if prev.dep_ in ["compound"]:
+                    obj = tokens[pos - 1: pos + 1]
+                else:
+                    obj = tokens[pos]
+                rel = v.lemma_ + " " + nxt.text if nxt.dep_ == "prep" else v.lemma_
+                for s in self.resolve(subject, mapping):
+                    for o in self.resolve(obj, mapping):
+                        svos.append((s, rel, o))
+
         return svos
 
 
@@ -153,65 +335,307 @@ class SpacyTriplesExtractor(TriplesExtractor):
 
         model = self.config.get("model", "en_core_web_trf")
         solve_coref = self.config.get("solve_coref", True)
-
-        if not spacy.util.is_package(model):
-            download(model)
+        self.batch_size = self.config.get("batch_size", 32)
+        self.n_process = self.config.get("n_process", 1)
+        # extract triples from the coreferee parse instead of re-parsing the resolved text
+        self.single_parse = self.config.get("single_parse", False)
+        self.model = model
+        self.offline = self.config.get("offline", False)
+        self.coref = None
+        # seconds spent per loading stage, filled when the model is loaded
+        self.load_timings: Dict[str, float] = {}
+        self._nlp: Optional[Language] = None
+        self._load_lock = threading.Lock()
+        # called with per stage timings and counters after every extraction, None disables it
+        self.metrics_callback: Optional[MetricsCallback] = self.config.get("metrics_callback")
+        # parsed docs persisted on disk, re-running the rules skips the model
+        self.doc_cache: Optional[DocCache] = None
+        if self.config.get("doc_cache"):
+            self.doc_cache = DocCache(self.config["doc_cache"],
+                                      max_mb=self.config.get("doc_cache_mb"))
+
+        # components skipped when parsing coref resolved text for the rule layer
+        self.disabled = PIPELINE_PROFILES["triples"]
+        # components added on top of the model, the pipeline is shared through the model pool
+        self.pipes = []
+        # pipes of the pool entry in use without solve_coref, see load
+        self._pool_pipes = []
+        # local alias index built with ovos_coreferee.linker, replaces spotlight
+        self.entity_index = self.config.get("entity_index")
+        if self.entity_index:
+            self.pipes.append((LINKER_PIPE, (("index_path", str(self.entity_index)),
+                                             ("overwrite_ents", self.config.get("overwrite_ents", False)))))
+        elif self.config.get("spotlight"):
+            if self.offline:
+                print("WARNING - dbpedia spotlight makes a network request per document, "
+                      "set 'entity_index' to link entities offline")
+            # the factory is registered through a spacy entry point, no import needed
+            if importlib.util.find_spec("spacy_dbpedia_spotlight") is not None:
+                self.pipes.append("dbpedia_spotlight")
+            else:
+                print("WARNING - dbpedia spotlight not available! "
+                      "pip install 'spacy_dbpedia_spotlight'")
         if solve_coref:
+            # single parse reads triples from the coref parse, so it needs every component
+            coref_profile = "full" if self.single_parse else self.config.get("coref_profile", "full")
+            # profile_mode "disable" since the same pipeline also serves the triples pass
             self.coref = CorefereeParser(first_person_token=self.first_person_token,
-                                         model=model)
-            self.nlp = self.coref.nlp
-        else:
-            self.nlp = spacy.load(model)
+                                         model=model, offline=self.offline,
+                                         profile=coref_profile,
+                                         extra_pipes=self.pipes)
+            if not self.single_parse:
+                # entities are linked when parsing the resolved text, not in the coref pass
+                self.coref.disabled = self.coref.disabled + [
+                    pipe if isinstance(pipe, str) else pipe[0] for pipe in self.pipes]
+        # long documents are resolved in overlapping windows of this many sentences
+        self.window: Optional[WindowedCorefResolver] = None
+        if self.coref is not None and self.config.get("coref_window"):
+            if self.single_parse:
+                print("WARNING - coref_window is not supported with single_parse, "
+                      "documents are resolved whole")
+            else:
+                self.window = WindowedCorefResolver(self.coref,
+                                                    window=self.config["coref_window"],
+                                                    overlap=self.config.get("coref_window_overlap", 2),
+                                                    lang=self.config.get("lang"))
+        if not self.config.get("lazy", True):
+            self.load()
+        elif self.config.get("warmup"):
+            threading.Thread(target=self.load, daemon=True).start()
+
+    @property
+    def nlp(self) -> Language:
+        if self._nlp is None:
+            self.load()
+        return self._nlp
+
+    def load(self) -> Language:
+        """Load spaCy model, blocks until ready"""
+        with self._load_lock:
+            if self._nlp is not None:
+                return self._nlp
+            if self.coref is not None:
+                nlp = self.coref.load()
+                self.load_timings = dict(self.coref.load_timings)
+            else:
+                pool = get_model_pool()
+                # share the pipeline of the coref users of this model when one is
+                # loaded, its coref components are disabled in the triples pass,
+                # but never load coreferee just for that
+                self._pool_pipes = COREF_PIPES + self.pipes
+                nlp = pool.acquire_loaded(self.model, pipes=self._pool_pipes)
+                if nlp is None:
+                    self._pool_pipes = list(self.pipes)
+                    nlp = pool.acquire(self.model, pipes=self._pool_pipes, offline=self.offline)
+                self.load_timings = dict(pool.load_timings.get(
+                    pool.make_key(self.model, pipes=self._pool_pipes), {}))
+            self._nlp = nlp
+        return self._nlp
+
+    def unload(self) -> None:
+        """release the model to the pool, it will be loaded again on next use"""
+        with self._load_lock:
+            if self._nlp is None:
+                return
+            if self.coref is not None:
+                self.coref.unload()
+            else:
+                get_model_pool().release(self.model, pipes=self._pool_pipes)
+            self._nlp = None
+
+    @property
+    def linker_stats(self) -> Dict[str, float]:
+        """lookups, hits and average lookup latency of the local entity linker"""
+        if not self.entity_index or self._nlp is None:
+            return {}
+        linker = self._nlp.get_pipe(LINKER_PIPE)
+        return dict(linker.stats, latency_ms=linker.latency_ms)
+
+    def extract_triples(self, documents: Iterable[str]) -> Iterable[Tuple[str, str, str]]:
+        """Extract semantic triples from a list of documents."""
+        for triples in self.extract_doc_triples(text for text in documents if text):
+            for t in triples:
+                yield t
+
+    def extract_doc_triples(self, texts: Iterable[str],
+                            n_process: Optional[int] = None) -> Iterator[List[Tuple[str, str, str]]]:
+        """triples of each (non empty) text, one list per input text in input order
+
+        with a metrics_callback, stage timings ("coref.*" for the coreference parse,
+        "triples.*" for the parse of the resolved text and the rule passes) and
+        counters are reported once the texts are exhausted"""
+        parser = IndexedDependencyParser()
+        n_process = self.n_process if n_process is None else n_process
+        metrics = None if self.metrics_callback is None else PipelineMetrics()
+        coref_metrics = metrics.scoped("coref") if metrics is not None else None
+        triples_metrics = metrics.scoped("triples") if metrics is not None else None
+
+        if self.coref is not None and self.single_parse:
+            for doc in self._coref_docs(texts, n_process, coref_metrics):
+                if metrics is None:
+                    mapping = self.coref.get_mapping(doc, join_tok=" and ")
+                else:
+                    with coref_metrics.timed("mapping"):
+                        mapping = self.coref.get_mapping(doc, join_tok=" and ")
+                    self.coref.count_doc(doc, len(mapping), coref_metrics)
+                yield self._extract_rules(parser, doc, mapping, triples_metrics)
+            self._emit_metrics(metrics)
+            return
+
+        if self.window is not None:
+            texts = self.window.replace_corefs_batch(texts, join_tok=" and ",
+                                                     batch_size=self.batch_size,
+                                                     n_process=n_process,
+                                                     metrics=coref_metrics)
+        elif self.coref is not None and self.doc_cache is not None:
+            texts = (self.coref._replace_corefs_doc(doc, " and ", coref_metrics)
+                     for doc in self._coref_docs(texts, n_process, coref_metrics))
+        elif self.coref is not None:
+            texts = self.coref.replace_corefs_batch(texts, join_tok=" and ",
+                                                    batch_size=self.batch_size,
+                                                    n_process=n_process,
+                                                    metrics=coref_metrics)
+        for doc in self._triples_docs(texts, n_process, triples_metrics):
+            # print([(tok, tok.pos_) for tok in doc])
+            yield self._extract_rules(parser, doc, None, triples_metrics)
+        self._emit_metrics(metrics)
+
+    @staticmethod
+    def _extract_rules(parser: DependencyParser, doc: Doc,
+                       mapping: Optional[Dict[int, str]] = None,
+                       metrics: Optional[PipelineMetrics] = None) -> List[Tuple[str, str, str]]:
+        if metrics is None:
+            return parser.extract_NER_preps(doc, mapping) + parser.find_svos(doc, mapping)
+        with metrics.timed("ner_preps"):
+            triples = parser.extract_NER_preps(doc, mapping)
+        with metrics.timed("svos"):
+            triples += parser.find_svos(doc, mapping)
+        metrics.count("tokens", len(doc))
+        metrics.count("triples", len(triples))
+        return triples
 
-        if self.config.get("spotlight"):
+    def _emit_metrics(self, metrics: Optional[PipelineMetrics]) -> None:
+        if metrics is not None and self.metrics_callback is not None:
+            data = metrics.to_dict()
+            data["model"] = self.model
+            self.metrics_callback(data)
+
+    def _coref_docs(self, texts: Iterable[str], n_process: int,
+                    metrics: Optional[PipelineMetrics] = None) -> Iterator[Doc]:
+        """coreferee parses, read from the doc cache when enabled"""
+        def parse(t):
+            return self.coref._pipe(t, self.coref.model, batch_size=self.batch_size,
+                                    n_process=n_process, metrics=metrics)
+
+        if self.doc_cache is None:
+            return parse(texts)
+        return self.doc_cache.pipe(texts, self.coref.get_nlp(), parse,
+                                   disable=self.coref.disabled)
+
+    def _triples_docs(self, texts: Iterable[str], n_process: int,
+                      metrics: Optional[PipelineMetrics] = None) -> Iterator[Doc]:
+        """parses of the (coref resolved) texts, read from the doc cache when enabled"""
+        def parse(t):
+            if metrics is not None and n_process == 1:
+                return timed_pipe(self.nlp, t, metrics, disable=self.disabled,
+                                  batch_size=self.batch_size)
+            return self.nlp.pipe(t, batch_size=self.batch_size,
+                                 disable=self.disabled, n_process=n_process)
+
+        if self.doc_cache is None:
+            return parse(texts)
+        return self.doc_cache.pipe(texts, self.nlp, parse, disable=self.disabled)
+
+    def extract_triples_stream(self, source: Union[str, os.PathLike, Iterable[str]],
+                               progress: Optional[Callable[[Dict[str, float]], None]] = None,
+                               report_every: float = 10.0) -> Iterator[Tuple[int, Tuple[str, str, str]]]:
+        """stream (document index, triple) from an iterable of documents or a text
+        file with one document per line
+
+        the source is read lazily by a single nlp.pipe, so worker processes are
+        started once and only the documents in flight are kept in memory. If the
+        pipeline fails (e.g. a crashed worker process) the documents in flight are
+        retried one at a time in this process, documents that still fail are
+        skipped, and a new pipeline continues with the rest of the source
+
+        progress is called with the running stats every report_every seconds and
+        once more when the source is exhausted"""
+        if isinstance(source, (str, os.PathLike)):
+            source = iter_lines(source)
+        source = enumerate(source)
+        stats = {"docs": 0, "triples": 0, "failed": 0,
+                 "docs_per_sec": 0.0, "triples_per_sec": 0.0}
+        start = last_report = time.monotonic()
+        # (index, text) of the documents handed to the pipeline and not extracted yet
+        inflight = deque()
+
+        def feed():
+            for idx, text in source:
+                stats["docs"] += 1
+                if text and text.strip():
+                    inflight.append((idx, text))
+                    yield text
+
+        def report(now):
+            elapsed = max(now - start, 1e-9)
+            stats["docs_per_sec"] = stats["docs"] / elapsed
+            stats["triples_per_sec"] = stats["triples"] / elapsed
+            if progress is not None:
+                progress(dict(stats))
+
+        done = False
+        while not done:
+            results = self.extract_doc_triples(feed())
             try:
-                self.nlp.add_pipe('dbpedia_spotlight')
+                for triples in results:
+                    idx, _ = inflight.popleft()
+                    stats["triples"] += len(triples)
+                    for t in triples:
+                        yield idx, t
+                    now = time.monotonic()
+                    if now - last_report >= report_every:
+                        last_report = now
+                        report(now)
+                done = True
             except Exception as e:
-                print("WARNING - dbpedia spotlight not available! "
-                      "pip install 'spacy_dbpedia_spotlight'")
+                if not inflight:  # not caused by a document, e.g. the model failed to load
+                    raise
+                print(f"WARNING - failed to process documents {inflight[0][0]}-{inflight[-1][0]} "
+                      f"({e}), retrying them one by one", file=sys.stderr)
+                retry = list(inflight)
+                inflight.clear()
+                for idx, triples in self._extract_one_by_one(retry, stats):
+                    stats["triples"] += len(triples)
+                    for t in triples:
+                        yield idx, t
+        report(time.monotonic())
+
+    def _extract_one_by_one(self, docs: List[Tuple[int, str]],
+                            stats: Dict[str, float]) -> Iterator[Tuple[int, List[Tuple[str, str, str]]]]:
+        for idx, text in docs:
+            try:
+                triples = next(self.extract_doc_triples([text], n_process=1))
+            except Exception as e:
+                print(f"WARNING - skipping document {idx}: {e}", file=sys.stderr)
+                stats["failed"] += 1
+                continue
+            yield idx, triples
 
-    def extract_triples(self, documents: List[str]) -> Iterable[Tuple[str, str, str]]:
-        """Extract semantic triples from a list of documents."""
-        parser = DependencyParser()
-
-        for idx, text in enumerate(documents):
-            if text:
-                if self.coref is not None:
-                    #print(text)
-                    text = self.coref.replace_corefs(text, join_tok=" and ")
-                    #print("COREF SOLVED:", text)
-                doc = self.nlp(text)
-                # print([(tok, tok.pos_) for tok in doc])
-                for t in parser.extract_NER_preps(doc):
-                    yield t
-                for t in parser.find_svos(doc):
-                    yield t
+    async def extract_triples_async(self, documents: List[str]) -> AsyncIterator[Tuple[str, str, str]]:
+        """non blocking extract_triples, inference runs in a worker thread and
+        triples are yielded as soon as they are extracted"""
+        async for triple in iterate_in_thread(self.extract_triples, documents):
+            yield triple
 
 
 if __name__ == "__main__":
+    from ovos_coreferee.corpus import TRIPLES_SENTENCES
+
     extractor = SpacyTriplesExtractor({"model": "en_core_web_trf",
                                        "spotlight": True,
                                        "first_person_token": "Miro"})
 
-    test = [
-        "Miro loves Dii.",
-        "Miro has a dog.",
-        "Miro is a software developer.",
-        "beer is nice",
-        "My name is Miro. I like beer",
-        "Mike is a nice guy",
-        "Chris was an asshole",
-        "Apple was founded in Cupertino in the year 1981.",
-        "Barrack Obama was born in Hawaii. He was president of the United States and lived in the White House.",
-        "London has been a major settlement for two millennia. It was founded by the Romans, who named it Londinium.",
-        "He was very busy with his work, Peter had had enough of it. He and his wife decided they needed a holiday. They travelled to Spain because they loved the country very much.",
-        "My name is Miro. I like beer",
-        "The ring belongs to me!",
-        "The ring is mine! My birthday gift, my precious",
-        "I love my baby",
-        "I have a dog, a cat and a bird. we are a happy family",
-        "Does Bob like coding? Yes he does"
-    ]
+    test = TRIPLES_SENTENCES
 
     for triple in extractor.extract_triples(test):
         print(triple)
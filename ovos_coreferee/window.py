@@ -0,0 +1,166 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import spacy
+from spacy.language import Language
+from spacy.tokens import Doc
+
+from ovos_coreferee.metrics import PipelineMetrics
+from ovos_coreferee.parser import COREF_CHAINS_KEY, CorefereeParser
+
+# runs of lines without a blank line between them, sentences never cross paragraphs
+_PARAGRAPH_RE = re.compile(r"(?:[^\n]|\n(?![ \t\r\f\v]*\n))+")
+
+# (context start, own start, end) character offsets of a window
+Window = Tuple[int, int, int]
+
+
+class WindowedCorefResolver:
+    """replace_corefs for long texts, resolved in overlapping windows of sentences
+
+    the first window parses `window` sentences, every following one parses
+    `window - overlap` new sentences preceded by the last `overlap` sentences of
+    the previous window as context, only the new sentences are rendered. Coreferee chains reaching into the context are stitched to the
+    previous window through a table of its chain resolutions by character offset,
+    so an entity keeps its name across any number of windows while the model,
+    and memory, only ever see one window at a time
+
+    windows of many texts are parsed as a single nlp.pipe stream. Texts shorter
+    than one window give the same output as CorefereeParser.replace_corefs, the
+    "we" heuristic only considers the nouns of the current window"""
+
+    def __init__(self, parser: CorefereeParser, window: int = 8, overlap: int = 2,
+                 lang: Optional[str] = None, max_chars: int = 100000) -> None:
+        if not 0 <= overlap < window:
+            raise ValueError("overlap must be smaller than the window")
+        self.parser = parser
+        # spaCy package names start with their language code, the sentencizer
+        # must not load the model just to find out
+        self.lang = lang or parser.model.split("_")[0]
+        self.window = window
+        self.overlap = overlap
+        # longest slice of a paragraph given to the sentencizer at once
+        self.max_chars = max_chars
+        self._sentencizer: Optional[Language] = None
+
+    @property
+    def sentencizer(self) -> Language:
+        """rule based sentence splitter, the model only ever sees windows"""
+        if self._sentencizer is None:
+            nlp = spacy.blank(self.lang)
+            nlp.add_pipe("sentencizer")
+            self._sentencizer = nlp
+        return self._sentencizer
+
+    def sentences(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(start, end) character offsets of the sentences, one paragraph at a time
+
+        paragraphs are sentencized in slices of at most max_chars characters, the
+        last sentence of a slice may be unfinished and starts the next slice"""
+        for paragraph in _PARAGRAPH_RE.finditer(text):
+            start, end = paragraph.span()
+            while start < end:
+                if text[start].isspace():
+                    start += 1
+                    continue
+                stop = min(start + self.max_chars, end)
+                if stop < end:
+                    # never cut a word in half
+                    cut = max(text.rfind(c, start + 1, stop) for c in " \t\n")
+                    if cut > start:
+                        stop = cut
+                sents = [(start + sent.start_char, start + sent.end_char)
+                         for sent in self.sentencizer(text[start:stop]).sents]
+                if stop < end and len(sents) > 1:
+                    start = sents.pop()[0]
+                else:
+                    # a single sentence longer than a slice is cut at the slice end
+                    start = stop
+                for sent_start, sent_end in sents:
+                    if text[sent_start:sent_end].strip():
+                        yield sent_start, sent_end
+
+    def windows(self, text: str) -> Iterator[Window]:
+        # the first window has no context, it takes a whole window of sentences
+        size = self.window
+        context = deque(maxlen=self.overlap)
+        own = []
+        for sent in self.sentences(text):
+            own.append(sent)
+            if len(own) == size:
+                yield (context[0][0] if context else own[0][0]), own[0][0], own[-1][1]
+                context.extend(own)
+                own = []
+                size = self.window - self.overlap
+        if own:
+            yield (context[0][0] if context else own[0][0]), own[0][0], own[-1][1]
+
+    def replace_corefs(self, text: str, join_tok=None) -> str:
+        return next(self.replace_corefs_batch([text], join_tok))
+
+    def replace_corefs_batch(self, texts: Iterable[str], join_tok=None,
+                             batch_size: int = 8, n_process: int = 1,
+                             metrics: Optional[PipelineMetrics] = None) -> Iterator[str]:
+        """resolved texts in input order, metrics are only collected, never reported"""
+        model = self.parser.select_model()
+        # (text, window or None for texts without sentences, last window of the text)
+        pending = deque()
+
+        def window_texts():
+            for text in texts:
+                prev = None
+                for window in self.windows(text):
+                    if prev is not None:
+                        pending.append((text, prev, False))
+                        yield text[prev[0]:prev[2]]
+                    prev = window
+                pending.append((text, prev, True))
+                if prev is not None:
+                    yield text[prev[0]:prev[2]]
+
+        pieces = []
+        carried: Dict[int, str] = {}
+        prev_end = 0
+        for doc in self.parser._pipe(window_texts(), model, batch_size, n_process, metrics):
+            while pending[0][1] is None:
+                yield pending.popleft()[0]
+            text, window, last = pending.popleft()
+            if metrics is None:
+                piece, carried = self._resolve_window(doc, window, carried, join_tok)
+            else:
+                with metrics.timed("mapping"):
+                    piece, carried = self._resolve_window(doc, window, carried, join_tok)
+                metrics.count("windows")
+            if pieces:
+                pieces.append(text[prev_end:window[1]] if self.parser.preserve_whitespace else " ")
+            pieces.append(piece)
+            prev_end = window[2]
+            if last:
+                yield "".join(pieces)
+                pieces, carried, prev_end = [], {}, 0
+        while pending:
+            yield pending.popleft()[0]
+
+    def _resolve_window(self, doc: Doc, window: Window, carried: Dict[int, str],
+                        join_tok=None) -> Tuple[str, Dict[int, str]]:
+        """render the new sentences of a window and the chain resolutions to carry over"""
+        ctx_start, own_start, _ = window
+        sources: Dict[int, int] = {}
+        mapping = self.parser.get_mapping(doc, join_tok, sources)
+        if carried:
+            # chains with a mention resolved by the previous window take its resolution
+            for chain_idx, chain in enumerate(doc.user_data[COREF_CHAINS_KEY]):
+                resolved = next((carried[ctx_start + doc[m[0]].idx] for m in chain
+                                 if ctx_start + doc[m[0]].idx in carried), None)
+                if resolved is None:
+                    continue
+                for mention in chain:
+                    if len(mention) == 1 and doc[mention[0]].text != resolved:
+                        mapping[mention[0]] = resolved
+                        sources[mention[0]] = chain_idx
+        first = next((tok.i for tok in doc if tok.idx >= own_start - ctx_start), len(doc))
+        text = self.parser.render(doc, mapping, start=first)
+        carried = {ctx_start + doc[i].idx: resolved for i, resolved in mapping.items()
+                   if sources.get(i, -1) >= 0}
+        return text, carried
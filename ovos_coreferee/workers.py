@@ -0,0 +1,209 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ovos_coreferee.aio import AsyncResolverMixin
+from ovos_coreferee.cache import CorefCache
+from ovos_coreferee.parser import COREF_PIPES, CorefereeParser, PIPELINE_PROFILES
+from ovos_coreferee.tiers import TierSelectionMixin
+
+# parser owned by a worker process, created once by the pool initializer
+_PARSER: Optional[CorefereeParser] = None
+
+
+def _init_worker(parser_kwargs: dict, reports) -> None:
+    """runs once in every worker before its first task, loads all the model tiers
+    since the tier of each request is chosen by the parent process"""
+    global _PARSER
+    _PARSER = CorefereeParser(**parser_kwargs)
+    for tier in _PARSER.tiers:
+        _PARSER.load(tier)
+    reports.put((os.getpid(), _PARSER.memory_bytes))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _solve(texts: List[str], join_tok=None, model: Optional[str] = None) -> List[str]:
+    return list(_PARSER.replace_corefs_batch(texts, join_tok=join_tok, model=model))
+
+
+class CorefWorkerPool(TierSelectionMixin, AsyncResolverMixin):
+    """coreference resolution in N worker processes, each loading the model once
+
+    exposes the same replace_corefs / replace_corefs_batch API as CorefereeParser
+    so it can be used as a drop-in backend, spaCy inference holds the GIL and
+    does not scale across cores inside a single process
+
+    at most max_pending requests are queued, submitting blocks up to timeout
+    seconds for a free slot before raising TimeoutError. A request that times
+    out raises in the caller but keeps running in its worker"""
+    # every worker has its own parser, micro-batches may run concurrently
+    serial_batches = False
+
+    def __init__(self, workers: int = 2, max_pending: int = 64, timeout: float = 30,
+                 cache: Optional[CorefCache] = None, mp_context: str = "spawn",
+                 **parser_kwargs) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self.cache = cache
+        # model tiers are selected here from the latency seen by the callers,
+        # so results can be cached per tier, every worker loads all of them
+        self._init_tiers(parser_kwargs.get("model", "en_core_web_trf"),
+                         parser_kwargs.get("fallback_models"),
+                         parser_kwargs.get("latency_budget"),
+                         parser_kwargs.get("probe_interval", 50))
+        self.first_person = parser_kwargs.get("first_person_token", "SPEAKER")
+        self.preserve_whitespace = parser_kwargs.get("preserve_whitespace", False)
+        # what the workers' parsers run, part of the cache key
+        profile = parser_kwargs.get("profile", "full")
+        if profile not in PIPELINE_PROFILES:
+            raise ValueError(f"unknown pipeline profile: {profile}")
+        self.disabled = list(PIPELINE_PROFILES[profile])
+        self.pipes = COREF_PIPES + list(parser_kwargs.get("extra_pipes", ()))
+        self.parser_kwargs = parser_kwargs
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # worker pid -> RSS growth caused by loading its model
+        self.memory: Dict[int, int] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._mp_context = mp_context
+        # (pid, memory) sent by every worker once its models are loaded
+        self._reports = multiprocessing.get_context(mp_context).Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self._mp_context),
+                    initializer=_init_worker,
+                    initargs=(self.parser_kwargs, self._reports))
+            return self._executor
+
+    @property
+    def loaded(self) -> bool:
+        return self._executor is not None
+
+    def _drain_reports(self) -> int:
+        """collect the reports of newly loaded workers, returns how many are loaded"""
+        while True:
+            try:
+                pid, memory = self._reports.get_nowait()
+            except queue.Empty:
+                break
+            self.memory[pid] = memory
+        return len(self.memory)
+
+    @property
+    def memory_bytes(self) -> int:
+        self._drain_reports()
+        return sum(self.memory.values())
+
+    def warmup(self) -> List[Future]:
+        """start the workers and load their models without blocking
+
+        the models are loaded by the pool initializer, which every worker runs
+        exactly once, the returned futures are done once a worker is ready"""
+        return [self.executor.submit(_ping) for _ in range(self.workers)]
+
+    def load(self) -> None:
+        """start the workers and block until all of them have loaded their models"""
+        for f in self.warmup():
+            f.result()
+        # the first ready worker may have run every warmup task, wait for the others
+        try:
+            while len(self.memory) < self.workers:
+                pid, memory = self._reports.get(timeout=self.timeout)
+                self.memory[pid] = memory
+        except queue.Empty:
+            raise TimeoutError("worker processes did not load their models in time")
+
+    def unload(self) -> None:
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+            self._drain_reports()  # reports of the stopped workers
+            self.memory.clear()
+
+    def submit(self, texts: List[str], join_tok=None, model: Optional[str] = None,
+               latency_budget: Optional[float] = None) -> Future:
+        model = model or self.select_model(latency_budget)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("coreference request queue is full")
+        # a worker reports once its models are loaded, if one did while this request
+        # was pending its startup and model load may be part of the time measured
+        loaded = self._drain_reports()
+        start = time.perf_counter()
+        try:
+            future = self.executor.submit(_solve, texts, join_tok, model)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        def done(f: Future) -> None:
+            self._slots.release()
+            if (not f.cancelled() and f.exception() is None and texts
+                    and self._drain_reports() == loaded):
+                # includes the time queued, that is the latency callers see
+                self._record_latency(model, (time.perf_counter() - start) / len(texts))
+
+        future.add_done_callback(done)
+        return future
+
+    def replace_corefs(self, text: str, join_tok=None, model: Optional[str] = None,
+                       latency_budget: Optional[float] = None) -> str:
+        return next(self.replace_corefs_batch([text], join_tok=join_tok, model=model,
+                                              latency_budget=latency_budget))
+
+    def replace_corefs_batch(self, texts: Iterable[str], join_tok=None,
+                             batch_size: int = 32, n_process: int = 1,
+                             model: Optional[str] = None,
+                             latency_budget: Optional[float] = None) -> Iterator[str]:
+        """texts are split in chunks of batch_size spread across the workers,
+        results are streamed in input order. n_process is ignored, use workers"""
+        model = model or self.select_model(latency_budget)
+        inflight = deque()
+
+        def submit(chunk):
+            misses = [text for text, _, solved in chunk if solved is None]
+            future = self.submit(misses, join_tok, model) if misses else None
+            inflight.append((chunk, future))
+
+        def collect():
+            chunk, future = inflight.popleft()
+            solved_misses = iter(future.result(self.timeout) if future else [])
+            for text, key, solved in chunk:
+                if solved is None:
+                    solved = next(solved_misses)
+                    if self.cache is not None:
+                        self.cache.put(key, solved)
+                yield solved
+
+        chunk = []
+        for text in texts:
+            key = self._cache_key(text, join_tok, model)
+            solved = self.cache.get(key) if self.cache is not None else None
+            chunk.append((text, key, solved))
+            if len(chunk) >= batch_size:
+                submit(chunk)
+                chunk = []
+                # keep every worker busy without queueing the whole input
+                if len(inflight) > self.workers:
+                    yield from collect()
+        if chunk:
+            submit(chunk)
+        while inflight:
+            yield from collect()
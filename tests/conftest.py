@@ -0,0 +1,21 @@
+import pytest
+
+
+class FakeClock:
+    """time.monotonic replacement, advanced by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """fake_clock(module) replaces time.monotonic as seen by that module"""
+    def patch(module) -> FakeClock:
+        clock = FakeClock()
+        monkeypatch.setattr(module.time, "monotonic", clock)
+        return clock
+    return patch
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("spacy")
+
+from ovos_coreferee import cache as cache_module
+from ovos_coreferee.cache import CorefCache
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(cache_module)
+
+
+def test_lru_eviction_order():
+    cache = CorefCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats["evictions"] == 1
+
+
+def test_put_refreshes_existing_key():
+    cache = CorefCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_ttl_expiration(clock):
+    cache = CorefCache(maxsize=10, ttl=5)
+    cache.put("a", 1)
+    clock.now += 4
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a", "missing") == "missing"
+    assert len(cache) == 0
+    assert cache.stats["expirations"] == 1
+
+
+def test_no_ttl_never_expires(clock):
+    cache = CorefCache(maxsize=10)
+    cache.put("a", 1)
+    clock.now += 10 ** 6
+    assert cache.get("a") == 1
+
+
+def test_zero_maxsize_disables_cache():
+    cache = CorefCache(maxsize=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_hit_miss_counters():
+    cache = CorefCache(maxsize=10)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    stats = cache.stats
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
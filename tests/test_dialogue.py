@@ -0,0 +1,110 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from spacy.tokens import Doc
+
+from ovos_coreferee import dialogue as dialogue_module
+from ovos_coreferee.dialogue import Antecedent, DialogueResolver
+from ovos_coreferee.parser import COREF_CHAINS_KEY, CorefereeParser
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(dialogue_module)
+
+
+def make_resolver(**kwargs):
+    # sessions are managed without ever touching the parser
+    return DialogueResolver(parser=None, **kwargs)
+
+
+def test_existing_session_is_not_evicted_when_full(clock):
+    resolver = make_resolver(max_sessions=2)
+    a = resolver.get_session("a")
+    b = resolver.get_session("b")
+    assert resolver.get_session("a") is a
+    assert resolver.get_session("b") is b
+    assert list(resolver.sessions) == ["a", "b"]
+
+
+def test_new_session_evicts_least_recently_seen(clock):
+    resolver = make_resolver(max_sessions=2)
+    a = resolver.get_session("a")
+    resolver.get_session("b")
+    clock.now += 1
+    resolver.get_session("a")  # "b" is now the least recently seen
+    resolver.get_session("c")
+    assert list(resolver.sessions) == ["a", "c"]
+    assert resolver.get_session("a") is a
+
+
+def test_idle_sessions_expire(clock):
+    resolver = make_resolver(session_ttl=10)
+    a = resolver.get_session("a")
+    clock.now += 5
+    resolver.get_session("b")
+    clock.now += 6
+    resolver.get_session("b")
+    assert "a" not in resolver.sessions
+    assert resolver.get_session("a") is not a
+
+
+def test_seen_session_does_not_expire(clock):
+    resolver = make_resolver(session_ttl=10)
+    a = resolver.get_session("a")
+    for _ in range(5):
+        clock.now += 6
+        assert resolver.get_session("a") is a
+
+
+def test_reset_drops_session(clock):
+    resolver = make_resolver()
+    a = resolver.get_session("a")
+    resolver.reset("a")
+    assert resolver.get_session("a") is not a
+
+
+@pytest.fixture
+def light_session():
+    resolver = DialogueResolver(CorefereeParser(model="en_core_web_sm"))
+    session = resolver.get_session("a")
+    session.turns.append([Antecedent("light")])
+    return resolver, session
+
+
+def make_doc(words, heads, deps, pos, lemmas):
+    doc = Doc(spacy.blank("en").vocab, words=words, heads=heads, deps=deps,
+              pos=pos, lemmas=lemmas)
+    doc.user_data[COREF_CHAINS_KEY] = []
+    return doc
+
+
+def resolve(resolver, session, doc):
+    result, _ = resolver._resolve_doc(doc, session)
+    return result.resolved
+
+
+def test_referring_it_is_filled_from_history(light_session):
+    doc = make_doc(["turn", "it", "off"], [0, 0, 0], ["ROOT", "dobj", "prt"],
+                   ["VERB", "PRON", "ADP"], ["turn", "it", "off"])
+    assert resolve(*light_session, doc) == "turn light off"
+
+
+def test_time_it_is_not_filled(light_session):
+    doc = make_doc(["what", "time", "is", "it"], [1, 2, 2, 2],
+                   ["det", "attr", "ROOT", "nsubj"], ["DET", "NOUN", "AUX", "PRON"],
+                   ["what", "time", "be", "it"])
+    assert resolve(*light_session, doc) == "what time is it"
+
+
+def test_weather_it_is_not_filled(light_session):
+    doc = make_doc(["it", "is", "raining"], [2, 2, 2], ["nsubj", "aux", "ROOT"],
+                   ["PRON", "AUX", "VERB"], ["it", "be", "rain"])
+    assert resolve(*light_session, doc) == "it is raining"
+
+
+def test_expletive_it_is_not_filled(light_session):
+    doc = make_doc(["it", "seems", "late"], [1, 1, 1], ["expl", "ROOT", "acomp"],
+                   ["PRON", "VERB", "ADJ"], ["it", "seem", "late"])
+    assert resolve(*light_session, doc) == "it seems late"
@@ -0,0 +1,118 @@
+import os
+import zlib
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+srsly = pytest.importorskip("srsly")
+
+from ovos_coreferee.doccache import DocCache
+from ovos_coreferee.parser import COREF_CHAINS_KEY
+
+TEXTS = ["the first document", "a second one", "and a third"]
+
+
+@pytest.fixture
+def nlp():
+    return spacy.blank("en")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DocCache(str(tmp_path / "docs"), chunk_size=2)
+    yield cache
+    cache.close()
+
+
+def parse_counting(nlp, calls):
+    def parse(texts):
+        for doc in nlp.pipe(texts):
+            calls.append(doc.text)
+            yield doc
+    return parse
+
+
+def test_cached_docs_skip_the_parser(cache, nlp):
+    calls = []
+    docs = list(cache.pipe(TEXTS, nlp, parse_counting(nlp, calls)))
+    assert [d.text for d in docs] == TEXTS
+    assert calls == TEXTS
+
+    calls.clear()
+    docs = list(cache.pipe(TEXTS + ["a new one"], nlp, parse_counting(nlp, calls)))
+    assert [d.text for d in docs] == TEXTS + ["a new one"]
+    assert calls == ["a new one"]
+    assert cache.stats["docs"] == 4
+
+
+def test_coref_chains_survive(cache, nlp):
+    doc = nlp("he said he was late")
+    doc.user_data[COREF_CHAINS_KEY] = [[[0], [2]]]
+    doc.user_data["other"] = object()
+    key = cache.make_key(doc.text, nlp)
+    cache.put_many([(key, doc)])
+    cache._decoded.clear()
+    cached = cache.get(key, nlp.vocab)
+    # msgpack gives the chains back as tuples
+    assert list(cached.user_data) == [COREF_CHAINS_KEY]
+    assert [[list(m) for m in chain] for chain in cached.user_data[COREF_CHAINS_KEY]] == [[[0], [2]]]
+    assert "other" in doc.user_data  # the original doc is left untouched
+
+
+def test_key_depends_on_pipeline(cache, nlp):
+    other = spacy.blank("en")
+    other.add_pipe("sentencizer")
+    key = cache.make_key("text", nlp)
+    assert cache.make_key("text", nlp) == key
+    assert cache.make_key("text", other) != key
+    assert cache.make_key("text", nlp, disable=["ner"]) != key
+    # pipes added after the first key change the digest
+    nlp.add_pipe("sentencizer")
+    assert cache.make_key("text", nlp) != key
+
+
+@pytest.mark.parametrize("garbage", [b"", b"not a docbin",
+                                     zlib.compress(b"\xc1\xc1\xc1 not msgpack"),
+                                     zlib.compress(b"\x92\x01"),
+                                     # valid msgpack, but not a DocBin
+                                     zlib.compress(srsly.msgpack_dumps(1)),
+                                     zlib.compress(srsly.msgpack_dumps({}))])
+def test_corrupted_chunk_is_a_miss_and_is_dropped(cache, nlp, garbage):
+    list(cache.pipe(TEXTS[:2], nlp))
+    chunk = cache._db.execute("SELECT id FROM chunks").fetchone()[0]
+    with open(cache._chunk_path(chunk), "wb") as f:
+        f.write(garbage)
+    cache._decoded.clear()
+
+    key = cache.make_key(TEXTS[0], nlp)
+    misses = cache.misses
+    assert cache.get(key, nlp.vocab) is None
+    assert cache.stats["docs"] == 0
+    assert cache.size_bytes == 0
+    assert cache.misses == misses + 1
+
+    # the documents are parsed and stored again
+    calls = []
+    list(cache.pipe(TEXTS[:2], nlp, parse_counting(nlp, calls)))
+    assert calls == TEXTS[:2]
+    assert cache.get(key, nlp.vocab).text == TEXTS[0]
+
+
+def test_deleted_chunk_is_a_miss(cache, nlp):
+    list(cache.pipe(TEXTS[:1], nlp))
+    chunk = cache._db.execute("SELECT id FROM chunks").fetchone()[0]
+    os.remove(cache._chunk_path(chunk))
+    cache._decoded.clear()
+    assert cache.get(cache.make_key(TEXTS[0], nlp), nlp.vocab) is None
+    assert cache.stats["docs"] == 0
+
+
+def test_size_budget_drops_least_recently_read(tmp_path, nlp):
+    cache = DocCache(str(tmp_path / "docs"), chunk_size=1)
+    list(cache.pipe(TEXTS, nlp))
+    sizes = [size for size, in cache._db.execute("SELECT size FROM chunks ORDER BY id")]
+    cache.max_mb = (sum(sizes) - 1) / 1024 / 1024
+    cache.enforce_budget()
+    assert cache.stats["docs"] == 2
+    assert cache.evictions == 1
+    cache.close()
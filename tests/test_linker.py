@@ -0,0 +1,65 @@
+import pickle
+
+import pytest
+
+pytest.importorskip("spacy")
+
+from ovos_coreferee.linker import AliasIndex, build_alias_index
+
+ROWS = [("Lisbon", "Q597", "GPE"),
+        ("New  York City", "Q60", "GPE"),
+        ("new york city", "Q1384", "GPE"),  # same alias once normalized, first wins
+        ("Ada Lovelace", "Q7259", "PERSON"),
+        ("ada", "Q7259", ""),
+        ("   ", "Q0", "")]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "entities.idx"
+    assert build_alias_index(ROWS, path) == 4
+    index = AliasIndex(path)
+    yield index
+    index.close()
+
+
+def test_lookup_round_trip(index):
+    assert len(index) == 4
+    assert index.max_words == 3
+    assert index.lookup("Lisbon") == ("Q597", "GPE")
+    assert index.lookup("NEW YORK  city") == ("Q60", "GPE")
+    assert index.lookup("Ada Lovelace") == ("Q7259", "PERSON")
+    assert index.lookup("ada") == ("Q7259", "")
+    assert index.lookup("Porto") is None
+    assert index.lookup("") is None
+
+
+def test_lookup_many(index):
+    hits = index.lookup_many(["ada", "zzz", "Lisbon", "aaa", "ada lovelace"])
+    assert hits == {"ada": ("Q7259", ""),
+                    "lisbon": ("Q597", "GPE"),
+                    "ada lovelace": ("Q7259", "PERSON")}
+
+
+def test_gazetteer_file(tmp_path):
+    tsv = tmp_path / "gazetteer.tsv"
+    tsv.write_text("# comment\nLisbon\tQ597\tGPE\nPorto\tQ36433\n\nmalformed\n",
+                   encoding="utf-8")
+    path = tmp_path / "entities.idx"
+    assert build_alias_index(tsv, path) == 2
+    index = AliasIndex(path)
+    assert index.lookup("porto") == ("Q36433", "")
+    index.close()
+
+
+def test_pickle_reopens_the_file(index):
+    copy = pickle.loads(pickle.dumps(index))
+    assert copy.lookup("lisbon") == ("Q597", "GPE")
+    copy.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_an_index"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        AliasIndex(path)
@@ -0,0 +1,137 @@
+import importlib.util
+import os
+import random
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from spacy.tokens import Doc
+
+from ovos_coreferee.parser import COREF_CHAINS_KEY, CorefereeParser
+
+# the original join-and-patch implementation, kept by the mapping benchmark
+_spec = importlib.util.spec_from_file_location(
+    "mapping_engine", os.path.join(os.path.dirname(__file__), "..", "benchmarks", "mapping_engine.py"))
+mapping_engine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(mapping_engine)
+
+VOCAB = spacy.blank("en").vocab
+
+
+def make_doc(words, pos, chains=(), spaces=None):
+    doc = Doc(VOCAB, words=words, spaces=spaces, pos=pos)
+    doc.user_data[COREF_CHAINS_KEY] = [list(chain) for chain in chains]
+    return doc
+
+
+def resolve(parser, doc, join_tok=None):
+    return parser.render(doc, parser.get_mapping(doc, join_tok))
+
+
+@pytest.fixture
+def parser():
+    return CorefereeParser(model="m")
+
+
+def test_first_person(parser):
+    doc = make_doc(["I", "have", "my", "dog", "and", "I", "love", "it", "."],
+                   ["PRON", "VERB", "PRON", "NOUN", "CCONJ", "PRON", "VERB", "PRON", "PUNCT"])
+    assert resolve(parser, doc) == "SPEAKER has SPEAKER's dog and SPEAKER loves it."
+
+
+def test_who_takes_the_previous_proper_noun(parser):
+    doc = make_doc(["Mary", ",", "who", "left", ",", "called", "."],
+                   ["PROPN", "PUNCT", "PRON", "VERB", "PUNCT", "VERB", "PUNCT"])
+    assert resolve(parser, doc) == "Mary, Mary left, called."
+
+
+def test_we_joins_the_nouns_seen_so_far(parser):
+    doc = make_doc(["John", "met", "Mary", "and", "we", "left"],
+                   ["PROPN", "VERB", "PROPN", "CCONJ", "PRON", "VERB"])
+    assert resolve(parser, doc) == "John met Mary and John and Mary left"
+
+
+def test_singular_chain_takes_the_longest_proper_noun(parser):
+    doc = make_doc(["the", "country", "is", "Spain", "and", "it", "is", "sunny"],
+                   ["DET", "NOUN", "AUX", "PROPN", "CCONJ", "PRON", "AUX", "ADJ"],
+                   chains=[[[1], [3], [5]]])
+    assert resolve(parser, doc) == "the Spain is Spain and Spain is sunny"
+
+
+def test_plural_chain_takes_the_joint_mention(parser):
+    doc = make_doc(["John", "and", "Mary", "said", "they", "left"],
+                   ["PROPN", "CCONJ", "PROPN", "VERB", "PRON", "VERB"],
+                   chains=[[[0, 2], [4]]])
+    assert resolve(parser, doc) == "John and Mary said John and Mary left"
+
+
+def test_legacy_spacing(parser):
+    doc = make_doc(["Hello", ",", "world", ".", "It", "'s", "me", "!"],
+                   ["INTJ", "PUNCT", "NOUN", "PUNCT", "PRON", "AUX", "PRON", "PUNCT"],
+                   spaces=[False, True, False, True, False, True, False, False])
+    assert resolve(parser, doc) == "Hello, world. It 's SPEAKER !"
+
+
+def test_preserve_whitespace():
+    parser = CorefereeParser(model="m", preserve_whitespace=True)
+    doc = make_doc(["Hello", ",", "world", ".", "It", "'s", "me", "!"],
+                   ["INTJ", "PUNCT", "NOUN", "PUNCT", "PRON", "AUX", "PRON", "PUNCT"],
+                   spaces=[False, True, False, True, False, True, False, False])
+    assert resolve(parser, doc) == "Hello, world. It's SPEAKER!"
+
+
+def test_render_offsets_point_at_the_replacements(parser):
+    doc = make_doc(["John", "said", "he", "left", "."],
+                   ["PROPN", "VERB", "PRON", "VERB", "PUNCT"], chains=[[[0], [2]]])
+    offsets = {}
+    text = parser.render(doc, parser.get_mapping(doc), offsets=offsets)
+    assert text == "John said John left."
+    assert [text[s:e] for s, e in offsets.values()] == ["John"]
+
+
+def test_render_from_start(parser):
+    doc = make_doc(["John", "left", ".", "He", "came", "back", "."],
+                   ["PROPN", "VERB", "PUNCT", "PRON", "VERB", "ADV", "PUNCT"],
+                   chains=[[[0], [3]]])
+    assert parser.render(doc, parser.get_mapping(doc), start=3) == "John came back."
+
+
+WORDS = {
+    "PRON": ["I", "me", "my", "mine", "we", "who", "he", "she", "it", "they"],
+    "PROPN": ["John", "Mary", "Spain", "London"],
+    "NOUN": ["dog", "country", "sister", "house"],
+    "VERB": ["have", "love", "make", "left", "said"],
+    "PUNCT": [",", ".", "!"],
+    "DET": ["the", "a"],
+    "CCONJ": ["and"],
+}
+
+
+def random_doc(rng):
+    n = rng.randint(1, 30)
+    pos = [rng.choice(list(WORDS)) for _ in range(n)]
+    words = [rng.choice(WORDS[p]) for p in pos]
+    spaces = [rng.random() < 0.8 for _ in range(n)]
+    # disjoint noun and pronoun mentions, mostly single tokens, grouped into chains
+    free = [i for i, p in enumerate(pos) if p in ("NOUN", "PROPN", "PRON")]
+    rng.shuffle(free)
+    chains = []
+    while len(free) >= 2 and len(chains) < 3:
+        chain = []
+        for _ in range(rng.randint(2, 3)):
+            if not free:
+                break
+            size = 2 if len(free) >= 2 and rng.random() < 0.2 else 1
+            chain.append(sorted(free.pop() for _ in range(size)))
+        if len(chain) >= 2:
+            chains.append(chain)
+    return make_doc(words, pos, chains, spaces)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_parity_with_the_reference_implementation(parser, seed):
+    doc = random_doc(random.Random(seed))
+    for join_tok in (None, " and "):
+        assert resolve(parser, doc, join_tok) == \
+            mapping_engine.reference_replace(parser, doc, join_tok)
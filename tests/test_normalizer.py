@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("spacy")
+pytest.importorskip("ovos_plugin_manager")
+
+from ovos_coreferee.opm import CorefereeNormalizerPlugin
+
+
+@pytest.fixture
+def plugin():
+    # the model is only loaded on first use, these tests never get there
+    return CorefereeNormalizerPlugin(config={"model": "en_core_web_sm",
+                                            "cache": False, "warmup": False})
+
+
+def test_plan_merges_spacing_duplicates(plugin):
+    context = {}
+    keys, todo = plugin._plan(["turn  it on", "turn it on ", "turn it on"], context)
+    assert keys == ["turn it on"] * 3
+    assert todo == ["turn it on"]
+    assert context["coref_duplicates"] == 2
+    assert context["coref_skipped"] == 0
+
+
+def test_plan_prefilter_skips_utterances_without_pronouns(plugin):
+    context = {}
+    keys, todo = plugin._plan(["what time is it", "what time is  it",
+                               "play some music"], context)
+    assert todo == ["what time is it"]
+    assert context["coref_duplicates"] == 1
+    assert context["coref_skipped"] == 1
+
+
+def test_plan_without_prefilter(plugin):
+    plugin.prefilter = False
+    context = {}
+    _, todo = plugin._plan(["play some music", "stop"], context)
+    assert todo == ["play some music", "stop"]
+    assert context["coref_skipped"] == 0
+
+
+def test_merge_keeps_originals_and_resolutions_in_order():
+    context = {}
+    norm, ctx = CorefereeNormalizerPlugin._merge(
+        ["turn on the light", "make it blue"],
+        ["turn on the light", "make the light blue"],
+        "en_core_web_sm", context)
+    assert norm == ["turn on the light", "make it blue", "make the light blue"]
+    assert ctx is context
+    assert context["coref_model"] == "en_core_web_sm"
+
+
+def test_merge_deduplicates():
+    norm, _ = CorefereeNormalizerPlugin._merge(["a", "a"], ["b", "b"], None, {})
+    assert norm == ["a", "b"]
+
+
+def test_transform_without_pronouns_skips_the_model(plugin):
+    norm, context = plugin.transform(["play some music"], {})
+    assert norm == ["play some music"]
+    assert not plugin.parser.loaded
+    assert context["coref_skipped"] == 1
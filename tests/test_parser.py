@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from spacy.language import Language
+
+from ovos_coreferee.parser import COREF_CHAINS_KEY, CorefereeParser
+from ovos_coreferee.workers import CorefWorkerPool
+
+LOAD_SECONDS = 0.5
+
+
+@Language.component("no_coref_chains")
+def no_coref_chains(doc):
+    doc.user_data[COREF_CHAINS_KEY] = []
+    return doc
+
+
+def slow_load(self, model=None):
+    """stands in for a model that takes a while to load"""
+    model = model or self.model
+    if model not in self._models:
+        time.sleep(LOAD_SECONDS)
+        nlp = spacy.blank("en")
+        nlp.add_pipe("no_coref_chains")
+        self._models[model] = nlp
+    return self._models[model]
+
+
+@pytest.fixture
+def slow_models(monkeypatch):
+    monkeypatch.setattr(CorefereeParser, "load", slow_load)
+
+
+def test_lazy_load_is_not_latency(slow_models):
+    parser = CorefereeParser(model="m")
+    assert parser.replace_corefs("he said so") == "he said so"
+    assert parser.latency["m"] < LOAD_SECONDS / 2
+
+
+def test_lazy_load_is_not_batch_latency(slow_models):
+    parser = CorefereeParser(model="m")
+    assert list(parser.replace_corefs_batch(["he said so", "and left"])) == \
+        ["he said so", "and left"]
+    assert parser.latency["m"] < LOAD_SECONDS / 2
+
+
+def test_worker_startup_is_not_latency(slow_models):
+    # forked workers inherit the slow fake model
+    pool = CorefWorkerPool(workers=1, mp_context="fork", model="m")
+    try:
+        assert pool.submit(["he said so"]).result(10) == ["he said so"]
+        time.sleep(0.1)
+        assert "m" not in pool.latency
+        assert pool.submit(["he said so"]).result(10) == ["he said so"]
+        # latency is recorded by a done callback, which may run after result() returns
+        deadline = time.monotonic() + 5
+        while "m" not in pool.latency and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.latency["m"] < LOAD_SECONDS / 2
+    finally:
+        pool.shutdown()
+
+
+def test_cache_key_depends_on_profile_and_pipes():
+    full = CorefereeParser(model="m")
+    coref = CorefereeParser(model="m", profile="coref")
+    extra = CorefereeParser(model="m", extra_pipes=["sentencizer"])
+    keys = {p._cache_key("he said so") for p in (full, coref, extra)}
+    assert len(keys) == 3
+    assert CorefereeParser(model="m")._cache_key("he said so") == full._cache_key("he said so")
+
+
+def test_worker_pool_cache_key_matches_the_parser():
+    for kwargs in ({}, {"profile": "coref"}, {"extra_pipes": ["sentencizer"]}):
+        pool = CorefWorkerPool(model="m", **kwargs)
+        parser = CorefereeParser(model="m", **kwargs)
+        assert pool._cache_key("he said so") == parser._cache_key("he said so")
+
+
+def test_slow_tier_falls_back_once_the_next_is_loaded():
+    parser = CorefereeParser(model="m", fallback_models=["s"], latency_budget=0.1)
+    warming = []
+    parser.warmup = warming.append
+    parser._models["m"] = object()
+    parser._record_latency("m", 1.0)
+    assert parser.select_model() == "m"
+    assert warming == ["s"]
+    parser._models["s"] = object()
+    assert parser.select_model() == "s"
+
+
+def test_worker_pool_tiers_are_always_ready():
+    pool = CorefWorkerPool(model="m", fallback_models=["s", "xs"], latency_budget=0.1)
+    pool._record_latency("m", 1.0)
+    assert pool.select_model() == "s"
+    pool._record_latency("s", 1.0)
+    assert pool.select_model() == "xs"
@@ -0,0 +1,88 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from ovos_coreferee import pool as pool_module
+from ovos_coreferee import triples as triples_module
+from ovos_coreferee.parser import COREF_PIPES
+from ovos_coreferee.pool import ModelPool
+from ovos_coreferee.triples import SpacyTriplesExtractor
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    loads = []
+
+    def load_model(model, offline=False, timings=None, exclude=()):
+        loads.append(model)
+        return spacy.blank("en")
+
+    pool = ModelPool()
+    pool.loads = loads
+    monkeypatch.setattr(pool_module, "load_model", load_model)
+    monkeypatch.setattr(triples_module, "get_model_pool", lambda: pool)
+    return pool
+
+
+def test_same_configuration_is_shared(pool):
+    a = pool.acquire("m", pipes=["sentencizer"])
+    b = pool.acquire("m", pipes=["sentencizer"])
+    assert a is b
+    assert pool.loads == ["m"]
+    assert pool.acquire("m") is not a
+    assert pool.loads == ["m", "m"]
+
+
+def test_release_drops_model_and_key_lock(pool):
+    pool.acquire("m")
+    pool.acquire("m")
+    key = pool.make_key("m")
+    pool.release("m")
+    assert key in pool._models
+    pool.release("m")
+    assert key not in pool._models
+    assert key not in pool._key_locks
+    assert key not in pool._refs
+
+
+def test_failed_load_releases_its_reference(pool, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("model not found")
+
+    monkeypatch.setattr(pool_module, "load_model", fail)
+    with pytest.raises(OSError):
+        pool.acquire("missing")
+    assert pool._refs == {}
+    assert pool._key_locks == {}
+
+
+def test_acquire_loaded_never_loads(pool):
+    assert pool.acquire_loaded("m", pipes=["sentencizer"]) is None
+    assert pool.loads == []
+    nlp = pool.acquire("m", pipes=["sentencizer"])
+    assert pool.acquire_loaded("m", pipes=["sentencizer"]) is nlp
+    assert pool._refs[pool.make_key("m", pipes=["sentencizer"])] == 2
+
+
+def test_extractor_without_coref_loads_the_plain_model(pool):
+    extractor = SpacyTriplesExtractor({"model": "m", "solve_coref": False})
+    nlp = extractor.load()
+    assert not set(COREF_PIPES) & set(nlp.pipe_names)
+    assert list(pool._models) == [pool.make_key("m")]
+    extractor.unload()
+    assert pool._models == {}
+
+
+def test_extractor_without_coref_reuses_a_loaded_coref_pipeline(pool):
+    # stands in for the pipeline a CorefereeParser of the same model loaded
+    key = pool.make_key("m", pipes=COREF_PIPES)
+    coref_nlp = spacy.blank("en")
+    pool._models[key] = coref_nlp
+    pool._refs[key] = 1
+
+    extractor = SpacyTriplesExtractor({"model": "m", "solve_coref": False})
+    assert extractor.load() is coref_nlp
+    assert pool.loads == []
+    assert pool._refs[key] == 2
+    extractor.unload()
+    assert pool._refs[key] == 1
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from spacy.tokens import Doc
+
+from ovos_coreferee.triples import DependencyParser, IndexedDependencyParser
+
+VOCAB = spacy.blank("en").vocab
+
+DEPS = ["nsubj", "nsubjpass", "expl", "agent", "dobj", "dative", "attr", "oprd", "pobj",
+        "acomp", "prep", "compound", "conj", "cc", "neg", "amod", "det", "advmod"]
+WORDS = {
+    "VERB": [("eats", "eat"), ("lives", "live"), ("gave", "give"), ("made", "make")],
+    "AUX": [("is", "be"), ("was", "be"), ("has", "have")],
+    "NOUN": [("dog", "dog"), ("house", "house"), ("president", "president")],
+    "PROPN": [("Obama", "Obama"), ("Hawaii", "Hawaii")],
+    "PRON": [("he", "he"), ("it", "it"), ("they", "they")],
+    "ADP": [("in", "in"), ("of", "of")],
+    "ADJ": [("big", "big")],
+    "DET": [("the", "the")],
+}
+
+
+def random_doc(rng):
+    """random dependency tree, every token attached to one placed before it"""
+    n = rng.randint(1, 25)
+    order = list(range(n))
+    rng.shuffle(order)
+    heads = [0] * n
+    deps = [""] * n
+    heads[order[0]] = order[0]
+    deps[order[0]] = "ROOT"
+    for k, i in enumerate(order[1:], 1):
+        heads[i] = rng.choice(order[:k])
+        deps[i] = rng.choice(DEPS)
+    words, lemmas, pos = [], [], []
+    for dep in deps:
+        if dep == "cc":
+            p, (word, lemma) = "CCONJ", ("and", "and")
+        elif dep == "neg":
+            p, (word, lemma) = "PART", rng.choice([("not", "not"), ("never", "never")])
+        else:
+            p = rng.choice(list(WORDS))
+            word, lemma = rng.choice(WORDS[p])
+        words.append(word)
+        lemmas.append(lemma)
+        pos.append(p)
+    return Doc(VOCAB, words=words, heads=heads, deps=deps, pos=pos, lemmas=lemmas)
+
+
+def svos_or_error(parser, tokens, mapping):
+    try:
+        return parser.find_svos(tokens, mapping)
+    except Exception as e:  # the reference fails on some malformed trees
+        return type(e)
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_indexed_find_svos_matches_the_reference(seed):
+    rng = random.Random(seed)
+    doc = random_doc(rng)
+    mapping = {i: rng.choice(["Peter", "Peter and wife", "dogs, cats and mice"])
+               for i in range(len(doc)) if rng.random() < 0.2}
+    reference, indexed = DependencyParser(), IndexedDependencyParser()
+    for m in (None, mapping):
+        assert svos_or_error(indexed, doc, m) == svos_or_error(reference, doc, m)
+        span = doc[len(doc) // 3:]
+        assert svos_or_error(indexed, span, m) == svos_or_error(reference, span, m)
+
+
+def test_indexed_find_svos_on_a_sentence():
+    words = ["Obama", "was", "born", "in", "Hawaii", "and", "he", "eats", "dogs"]
+    doc = Doc(VOCAB, words=words,
+              heads=[2, 2, 2, 2, 3, 2, 7, 2, 7],
+              deps=["nsubjpass", "auxpass", "ROOT", "prep", "pobj", "cc", "nsubj", "conj", "dobj"],
+              pos=["PROPN", "AUX", "VERB", "ADP", "PROPN", "CCONJ", "PRON", "VERB", "NOUN"],
+              lemmas=["Obama", "be", "bear", "in", "Hawaii", "and", "he", "eat", "dog"])
+    expected = DependencyParser().find_svos(doc, {6: "Obama"})
+    assert ("Obama", "eat", "dogs") in expected
+    assert IndexedDependencyParser().find_svos(doc, {6: "Obama"}) == expected
@@ -0,0 +1,113 @@
+import pytest
+
+pytest.importorskip("spacy")
+
+from ovos_coreferee.window import WindowedCorefResolver
+
+
+class FakeParser:
+    # windows() only needs the model name for the sentencizer language
+    model = "en_core_web_sm"
+
+
+def text_of(n):
+    return " ".join(f"Sentence number {i}." for i in range(n))
+
+
+def own_sentences(resolver, text):
+    """sentences rendered by every window"""
+    sents = list(resolver.sentences(text))
+    return [[i for i, (start, end) in enumerate(sents) if own <= start and end <= stop]
+            for _, own, stop in resolver.windows(text)]
+
+
+def context_sentences(resolver, text):
+    sents = list(resolver.sentences(text))
+    return [[i for i, (start, _) in enumerate(sents) if ctx <= start < own]
+            for ctx, own, _ in resolver.windows(text)]
+
+
+@pytest.fixture
+def resolver():
+    return WindowedCorefResolver(FakeParser(), window=4, overlap=1)
+
+
+def test_sentencizer_does_not_load_the_model(resolver):
+    assert resolver.lang == "en"
+    assert len(list(resolver.sentences(text_of(3)))) == 3
+
+
+def test_lang_override():
+    assert WindowedCorefResolver(FakeParser(), lang="de").lang == "de"
+
+
+def test_invalid_overlap():
+    with pytest.raises(ValueError):
+        WindowedCorefResolver(FakeParser(), window=4, overlap=4)
+
+
+def test_empty_text(resolver):
+    assert list(resolver.windows("")) == []
+    assert list(resolver.windows("   \n\n  ")) == []
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4])
+def test_text_up_to_one_window_is_not_split(resolver, n):
+    text = text_of(n)
+    windows = list(resolver.windows(text))
+    assert len(windows) == 1
+    ctx, own, end = windows[0]
+    assert ctx == own == 0
+    assert end == len(text)
+
+
+def test_first_window_is_full(resolver):
+    text = text_of(5)
+    assert own_sentences(resolver, text) == [[0, 1, 2, 3], [4]]
+    assert context_sentences(resolver, text) == [[], [3]]
+
+
+def test_following_windows_step_by_window_minus_overlap(resolver):
+    text = text_of(11)
+    assert own_sentences(resolver, text) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+    assert context_sentences(resolver, text) == [[], [3], [6], [9]]
+
+
+def test_windows_cover_the_text_once(resolver):
+    text = text_of(23)
+    windows = list(resolver.windows(text))
+    sents = list(resolver.sentences(text))
+    assert windows[0][1] == sents[0][0]
+    assert windows[-1][2] == sents[-1][1]
+    for (_, _, end), (_, own, _) in zip(windows, windows[1:]):
+        assert end <= own
+
+
+def test_no_overlap():
+    resolver = WindowedCorefResolver(FakeParser(), window=2, overlap=0)
+    text = text_of(5)
+    assert own_sentences(resolver, text) == [[0, 1], [2, 3], [4]]
+    assert context_sentences(resolver, text) == [[], [], []]
+
+
+def test_sentences_never_cross_paragraphs(resolver):
+    text = "First line without a stop\n\nSecond paragraph here. And more."
+    sents = [text[s:e] for s, e in resolver.sentences(text)]
+    assert sents[0] == "First line without a stop"
+    assert len(sents) == 3
+
+
+def test_long_paragraphs_are_sentencized_in_slices(resolver):
+    text = text_of(200)
+    whole = list(resolver.sentences(text))
+    resolver.max_chars = 50
+    assert list(resolver.sentences(text)) == whole
+    assert len(whole) == 200
+
+
+def test_sentence_longer_than_a_slice_is_cut():
+    resolver = WindowedCorefResolver(FakeParser(), max_chars=20)
+    text = "a very long sentence without any stop at all"
+    sents = list(resolver.sentences(text))
+    assert all(end - start <= 20 for start, end in sents)
+    assert " ".join(text[s:e] for s, e in sents) == text